@@ -1,4 +1,4 @@
-import { useState, useRef, useEffect } from 'react'
+import { useMemo, useState } from 'react'
 import { useTranslation } from 'react-i18next'
 import { Canvas } from '@react-three/fiber'
 import { OrbitControls, PerspectiveCamera } from '@react-three/drei'
@@ -9,26 +9,28 @@ import { Move, CubeState } from './utils/cubeTypes'
 import { createSolvedCubieBasedCube, applyMove, cubieBasedStateToFaceColors } from './utils/cubieBasedCubeLogic'
 import { CubieBasedCubeState } from './utils/cubeTypes'
 import { SolverAlgorithm } from './utils/cubeSolver'
-import { AnimationState, getAnimationInfo } from './utils/cubeAnimation'
+import { MovePlaybackEngine } from './utils/cubeAnimation'
 import './App.css'
 
 function App() {
   const { t } = useTranslation()
   const [cubieBasedState, setCubieBasedState] = useState<CubieBasedCubeState>(createSolvedCubieBasedCube())
-  // 将CubieBasedCubeState转换为CubeState用于渲染
-  const cubeState: CubeState = cubieBasedStateToFaceColors(cubieBasedState)
+  // 将CubieBasedCubeState转换为CubeState用于渲染（只在逻辑状态变化时重算，RubiksCube 据此重置变换）
+  const cubeState: CubeState = useMemo(() => cubieBasedStateToFaceColors(cubieBasedState), [cubieBasedState])
   const [isAnimating, setIsAnimating] = useState(false)
   const [solution, setSolution] = useState<Move[]>([])
   const [currentStep, setCurrentStep] = useState(0)
   const [scrambleMoves, setScrambleMoves] = useState<Move[]>([]) // 记录打乱序列
   const [moveHistory, setMoveHistory] = useState<Move[]>([]) // 记录手动操作历史
   const [selectedAlgorithm, setSelectedAlgorithm] = useState<SolverAlgorithm>('reverse-moves') // 默认使用反向移动
-  const [animationState, setAnimationState] = useState<AnimationState | null>(null)
-  const animationStartTimeRef = useRef<number | null>(null)
+  // 播放队列在 React 之外按帧推进，App 只负责入队和在整批播完后提交状态
+  const [playback] = useState(() => new MovePlaybackEngine())
+  const [isCubeAnimating, setIsCubeAnimating] = useState(false)
+  const [playbackSpeed, setPlaybackSpeed] = useState(playback.speed)
   const [showCameraModal, setShowCameraModal] = useState(false)
 
   const handleScramble = () => {
-    if (isAnimating || animationState?.isAnimating) return
+    if (isAnimating || isCubeAnimating) return
     const moves: Move[] = []
     const moveTypes: Move[] = ['R', "R'", 'L', "L'", 'U', "U'", 'D', "D'", 'F', "F'", 'B', "B'"]
     
@@ -49,7 +51,7 @@ function App() {
   }
 
   const handleSolve = async () => {
-    if (isAnimating || animationState?.isAnimating) return
+    if (isAnimating || isCubeAnimating) return
     
     try {
       setIsAnimating(true)
@@ -101,78 +103,53 @@ function App() {
     }
   }
 
-  // 动画循环
-  useEffect(() => {
-    if (animationState && animationState.isAnimating) {
-      const startTime = Date.now()
-      animationStartTimeRef.current = startTime
-      
-      const animate = () => {
-        if (!animationState || !animationStartTimeRef.current) return
-        
-        const elapsed = (Date.now() - animationStartTimeRef.current) / 1000 // 秒
-        const duration = Math.abs(animationState.angle) / (Math.PI * 2) * 0.5 // 根据角度计算持续时间（0.5秒转一圈）
-        const progress = Math.min(elapsed / duration, 1)
-        
-        setAnimationState(prev => {
-          if (!prev) return null
-          return { ...prev, progress }
-        })
-        
-        if (progress < 1) {
-          requestAnimationFrame(animate)
-        } else {
-          // 动画完成，更新状态
-          if (animationState.move) {
-            setCubieBasedState(prev => applyMove(prev, animationState.move!))
-            setMoveHistory(prev => [...prev, animationState.move!])
-          }
-          setAnimationState(null)
-          animationStartTimeRef.current = null
-        }
-      }
-      
-      requestAnimationFrame(animate)
-    }
-  }, [animationState?.isAnimating])
-  
-  /** 若当前可开始转动动画则返回 true；被求解或转动动画占用时返回 false */
-  const tryBeginMove = (move: Move): boolean => {
-    if (isAnimating || animationState?.isAnimating) return false
-
-    const { axis, angle, affectedCubies, rotationCenter } = getAnimationInfo(move)
-
-    setAnimationState({
-      isAnimating: true,
-      move,
-      progress: 0,
-      axis,
-      angle,
-      affectedCubies,
-      rotationCenter,
-    })
+  /** 整批播放完毕：一次性把本批步应用到逻辑状态 */
+  const handleBatchComplete = (moves: Move[]) => {
+    setCubieBasedState(prev => moves.reduce(applyMove, prev))
+    setMoveHistory(prev => [...prev, ...moves])
+    setIsCubeAnimating(false)
+  }
+
+  /** 把步加入播放队列；求解计算进行中时不接受 */
+  const enqueueMoves = (moves: Move[]): boolean => {
+    if (isAnimating || moves.length === 0) return false
+    playback.enqueue(moves)
+    setIsCubeAnimating(true)
     return true
   }
 
   const handleMove = (move: Move) => {
-    tryBeginMove(move)
+    enqueueMoves([move])
   }
 
+  // 单步按钮在播放中也会入队，currentStep 立即前进，队列保证这些步都会被执行
   const handleStepForward = () => {
     if (currentStep >= solution.length) return
-    const move = solution[currentStep]
-    if (!tryBeginMove(move)) return
+    if (!enqueueMoves([solution[currentStep]])) return
     setCurrentStep(prev => prev + 1)
   }
 
   const handleStepBackward = () => {
     if (currentStep <= 0) return
-    const move = solution[currentStep - 1]
-    const reversedMove = reverseMove(move)
-    if (!tryBeginMove(reversedMove)) return
+    if (!enqueueMoves([reverseMove(solution[currentStep - 1])])) return
     setCurrentStep(prev => prev - 1)
   }
 
+  /** 播放剩余的全部解法步 */
+  const handlePlaySolution = () => {
+    if (!enqueueMoves(solution.slice(currentStep))) return
+    setCurrentStep(solution.length)
+  }
+
+  const handleFastForward = () => {
+    playback.fastForward()
+  }
+
+  const handlePlaybackSpeedChange = (quarterTurnsPerSecond: number) => {
+    playback.setSpeed(quarterTurnsPerSecond)
+    setPlaybackSpeed(playback.speed)
+  }
+
   const reverseMove = (move: Move): Move => {
     if (move.endsWith("'")) {
       return move.slice(0, -1) as Move
@@ -220,7 +197,7 @@ function App() {
           <ambientLight intensity={0.5} />
           <directionalLight position={[10, 10, 5]} intensity={1} />
           <pointLight position={[-10, -10, -10]} intensity={0.5} />
-          <RubiksCube cubeState={cubeState} animationState={animationState} />
+          <RubiksCube cubeState={cubeState} playback={playback} onBatchComplete={handleBatchComplete} />
           <OrbitControls enablePan={false} minDistance={3} maxDistance={15} />
         </Canvas>
       </div>
@@ -230,9 +207,13 @@ function App() {
         onMove={handleMove}
         onStepForward={handleStepForward}
         onStepBackward={handleStepBackward}
+        onPlaySolution={handlePlaySolution}
+        onFastForward={handleFastForward}
+        playbackSpeed={playbackSpeed}
+        onPlaybackSpeedChange={handlePlaybackSpeedChange}
         onCameraInput={handleCameraInput}
         isAnimating={isAnimating}
-        isCubeAnimating={!!animationState?.isAnimating}
+        isCubeAnimating={isCubeAnimating}
         solution={solution}
         currentStep={currentStep}
         selectedAlgorithm={selectedAlgorithm}
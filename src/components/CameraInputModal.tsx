@@ -8,6 +8,7 @@ import { useTranslation } from 'react-i18next'
 import { Face, FaceColor } from '../utils/cubeTypes'
 import { CubeInputState, createEmptyInputState, inputStateToCubeState, isInputStateComplete, isFaceComplete } from '../utils/cubeInputConverter'
 import { requestCamera, stopCamera, recognizeFaceColors } from '../utils/cameraColorRecognition'
+import { repairCubeInputState } from '../utils/stickerRepair'
 import CubeNetInput from './CubeNetInput'
 import OperationInstructions from './OperationInstructions'
 import './CameraInputModal.css'
@@ -120,10 +121,17 @@ export default function CameraInputModal({ isOpen, onClose, onComplete }: Camera
           ? r.map((c, cIdx) => (cIdx === col ? color : c))
           : r
       )
+      // 手动确认的贴纸视为完全可信，自动修复时不会优先改动
+      const newConfidence = prev.faces[face].confidence.map((r, rIdx) =>
+        rIdx === row
+          ? r.map((c, cIdx) => (cIdx === col ? 1 : c))
+          : r
+      )
       
       const updatedFace = {
         ...prev.faces[face],
         colors: newColors,
+        confidence: newConfidence,
       }
       
       // 检查该面是否完成（所有边缘块都不是black）
@@ -141,6 +149,36 @@ export default function CameraInputModal({ isOpen, onClose, onComplete }: Camera
     })
   }
 
+  const handleAutoRepair = () => {
+    // 未扫描的面全是 black（代价为 0），修复会凭空补出整面，因此要求六面都已录入
+    if (!isInputStateComplete(inputState)) {
+      alert(t('camera.completeAllFaces'))
+      return
+    }
+    const { candidates, elapsedMs } = repairCubeInputState(inputState)
+    const best = candidates[0]
+    if (!best || best.edits.length === 0) {
+      alert(t('camera.repairNotNeeded'))
+      return
+    }
+
+    setInputState(prev => {
+      const faces = { ...prev.faces }
+      // 只改候选列出的贴纸，其余颜色与完成状态保持原样
+      for (const edit of best.edits) {
+        const face = faces[edit.face]
+        const colors = face.colors.map(r => [...r])
+        const confidence = face.confidence.map(r => [...r])
+        colors[edit.row][edit.col] = edit.to
+        // 被修改的贴纸是推断值，置信度清零，下次修复可再调整
+        confidence[edit.row][edit.col] = 0
+        faces[edit.face] = { ...face, colors, confidence }
+      }
+      return { faces }
+    })
+    alert(t('camera.repairApplied', { count: best.edits.length, ms: elapsedMs.toFixed(1) }))
+  }
+
   const handleFinish = () => {
     if (isInputStateComplete(inputState)) {
       const cubeState = inputStateToCubeState(inputState)
@@ -233,6 +271,13 @@ export default function CameraInputModal({ isOpen, onClose, onComplete }: Camera
             <button className="btn btn-secondary" onClick={onClose}>
               {t('camera.cancel')}
             </button>
+            <button
+              className="btn btn-secondary"
+              onClick={handleAutoRepair}
+              disabled={!allComplete}
+            >
+              {t('camera.autoRepair')}
+            </button>
             <button
               className="btn btn-primary"
               onClick={handleFinish}
@@ -10,6 +10,13 @@ interface ControlPanelProps {
   onMove: (move: Move) => void
   onStepForward: () => void
   onStepBackward: () => void
+  /** 播放剩余全部解法步 */
+  onPlaySolution: () => void
+  /** 立即完成当前播放队列 */
+  onFastForward: () => void
+  /** 播放速度（每秒四分之一转数） */
+  playbackSpeed: number
+  onPlaybackSpeedChange: (quarterTurnsPerSecond: number) => void
   onCameraInput: () => void
   isAnimating: boolean
   /** 魔方转动动画进行中（与求解中的 isAnimating 区分） */
@@ -20,12 +27,19 @@ interface ControlPanelProps {
   onAlgorithmChange: (algorithm: SolverAlgorithm) => void
 }
 
+/** 可选播放速度（每秒四分之一转数，4 为默认 1x） */
+const PLAYBACK_SPEEDS = [2, 4, 8, 16, 32]
+
 export default function ControlPanel({
   onScramble,
   onSolve,
   onMove,
   onStepForward,
   onStepBackward,
+  onPlaySolution,
+  onFastForward,
+  playbackSpeed,
+  onPlaybackSpeedChange,
   onCameraInput,
   isAnimating,
   isCubeAnimating = false,
@@ -36,6 +50,7 @@ export default function ControlPanel({
 }: ControlPanelProps) {
   const { t } = useTranslation()
   const busy = isAnimating || isCubeAnimating
+  // 转动按钮只在求解计算时禁用；动画播放中点击会进入播放队列
   const moves: Move[] = [
     'R', "R'", 'R2',
     'L', "L'", 'L2',
@@ -94,13 +109,35 @@ export default function ControlPanel({
 
       <div className="panel-section">
         <h3>{t('control.manualOps')}</h3>
+        <div className="playback-controls">
+          <label htmlFor="playback-speed-select">{t('control.speedLabel')}</label>
+          <select
+            id="playback-speed-select"
+            value={playbackSpeed}
+            onChange={(e) => onPlaybackSpeedChange(Number(e.target.value))}
+            className="algorithm-select"
+          >
+            {PLAYBACK_SPEEDS.map((speed) => (
+              <option key={speed} value={speed}>
+                {speed / 4}x
+              </option>
+            ))}
+          </select>
+          <button
+            className="btn btn-secondary"
+            onClick={onFastForward}
+            disabled={!isCubeAnimating}
+          >
+            {t('control.fastForward')}
+          </button>
+        </div>
         <div className="move-buttons">
           {moves.map((move) => (
             <button
               key={move}
               className="btn btn-move"
               onClick={() => onMove(move)}
-              disabled={busy}
+              disabled={isAnimating}
             >
               {move}
             </button>
@@ -119,17 +156,24 @@ export default function ControlPanel({
             <button
               className="btn btn-secondary"
               onClick={onStepBackward}
-              disabled={busy || currentStep === 0}
+              disabled={isAnimating || currentStep === 0}
             >
               {t('control.prevStep')}
             </button>
             <button
               className="btn btn-secondary"
               onClick={onStepForward}
-              disabled={busy || currentStep >= solution.length}
+              disabled={isAnimating || currentStep >= solution.length}
             >
               {t('control.nextStep')}
             </button>
+            <button
+              className="btn btn-secondary"
+              onClick={onPlaySolution}
+              disabled={isAnimating || currentStep >= solution.length}
+            >
+              {t('control.playAll')}
+            </button>
           </div>
           <div className="solution-steps">
             <div className="steps-list">
@@ -26,38 +26,40 @@ const COLOR_MAP: Record<FaceColor, string> = {
 }
 
 export default function Cubie({ position, colors, size }: CubieProps) {
+  // 按各面颜色而非 colors 对象做依赖：整批提交后只有颜色变了的小块重建材质
+  const { front, back, top, bottom, right, left } = colors
   const materials = useMemo(() => [
     new THREE.MeshStandardMaterial({
-      color: colors.right ? COLOR_MAP[colors.right] : '#333333',
-      emissive: colors.right ? COLOR_MAP[colors.right] : '#000000',
+      color: right ? COLOR_MAP[right] : '#333333',
+      emissive: right ? COLOR_MAP[right] : '#000000',
       emissiveIntensity: 0.1,
     }), // 右面
     new THREE.MeshStandardMaterial({
-      color: colors.left ? COLOR_MAP[colors.left] : '#333333',
-      emissive: colors.left ? COLOR_MAP[colors.left] : '#000000',
+      color: left ? COLOR_MAP[left] : '#333333',
+      emissive: left ? COLOR_MAP[left] : '#000000',
       emissiveIntensity: 0.1,
     }), // 左面
     new THREE.MeshStandardMaterial({
-      color: colors.top ? COLOR_MAP[colors.top] : '#333333',
-      emissive: colors.top ? COLOR_MAP[colors.top] : '#000000',
+      color: top ? COLOR_MAP[top] : '#333333',
+      emissive: top ? COLOR_MAP[top] : '#000000',
       emissiveIntensity: 0.1,
     }), // 上面
     new THREE.MeshStandardMaterial({
-      color: colors.bottom ? COLOR_MAP[colors.bottom] : '#333333',
-      emissive: colors.bottom ? COLOR_MAP[colors.bottom] : '#000000',
+      color: bottom ? COLOR_MAP[bottom] : '#333333',
+      emissive: bottom ? COLOR_MAP[bottom] : '#000000',
       emissiveIntensity: 0.1,
     }), // 下面
     new THREE.MeshStandardMaterial({
-      color: colors.front ? COLOR_MAP[colors.front] : '#333333',
-      emissive: colors.front ? COLOR_MAP[colors.front] : '#000000',
+      color: front ? COLOR_MAP[front] : '#333333',
+      emissive: front ? COLOR_MAP[front] : '#000000',
       emissiveIntensity: 0.1,
     }), // 前面
     new THREE.MeshStandardMaterial({
-      color: colors.back ? COLOR_MAP[colors.back] : '#333333',
-      emissive: colors.back ? COLOR_MAP[colors.back] : '#000000',
+      color: back ? COLOR_MAP[back] : '#333333',
+      emissive: back ? COLOR_MAP[back] : '#000000',
       emissiveIntensity: 0.1,
     }), // 后面
-  ], [colors])
+  ], [front, back, top, bottom, right, left])
 
   return (
     <mesh position={position} material={materials}>
@@ -1,110 +1,105 @@
-import { useRef } from 'react'
+import { useLayoutEffect, useRef } from 'react'
 import { useFrame } from '@react-three/fiber'
 import * as THREE from 'three'
-import { CubeState } from '../utils/cubeTypes'
-import { AnimationState } from '../utils/cubeAnimation'
+import { CubeState, Move } from '../utils/cubeTypes'
+import { describeTurn, MovePlaybackEngine } from '../utils/cubeAnimation'
 import Cubie from './Cubie'
 
 interface RubiksCubeProps {
   cubeState: CubeState
-  animationState: AnimationState | null
+  /** 帧驱动的播放队列（由 App 持有，本组件每帧 tick） */
+  playback: MovePlaybackEngine
+  /** 队列排空时回调一次，交出本批已播放完的步，由上层一次性提交逻辑状态 */
+  onBatchComplete: (moves: Move[]) => void
 }
 
-export default function RubiksCube({ cubeState, animationState }: RubiksCubeProps) {
+/**
+ * 每个 cubie group 的播放期状态：grid 为当前所在格（整数坐标），
+ * quaternion 为已转完的步累积的朝向。整批提交后 cubeState 更新，全部重置回原位。
+ */
+interface CubieSlot {
+  home: THREE.Vector3
+  grid: THREE.Vector3
+  quaternion: THREE.Quaternion
+}
+
+const AXES = [new THREE.Vector3(1, 0, 0), new THREE.Vector3(0, 1, 0), new THREE.Vector3(0, 0, 1)]
+const AXIS_KEYS = ['x', 'y', 'z'] as const
+const SPACING = 1.02 // 小块之间的间距
+
+export default function RubiksCube({ cubeState, playback, onBatchComplete }: RubiksCubeProps) {
   const groupRef = useRef<THREE.Group>(null)
   const cubieRefs = useRef<Map<string, THREE.Group>>(new Map())
-  
-  // 动画速度（每秒旋转的弧度）
-  const ANIMATION_SPEED = Math.PI * 2 // 每秒旋转一圈（360度）
-  
+  const slotsRef = useRef<Map<string, CubieSlot>>(new Map())
+  const onBatchCompleteRef = useRef(onBatchComplete)
+  onBatchCompleteRef.current = onBatchComplete
+
+  const slotFor = (key: string, x: number, y: number, z: number): CubieSlot => {
+    let slot = slotsRef.current.get(key)
+    if (!slot) {
+      slot = {
+        home: new THREE.Vector3(x, y, z),
+        grid: new THREE.Vector3(x, y, z),
+        quaternion: new THREE.Quaternion(),
+      }
+      slotsRef.current.set(key, slot)
+    }
+    return slot
+  }
+
+  // 新的 cubeState 已包含此前播放完的步：颜色按原位重新着色，变换全部归位
+  useLayoutEffect(() => {
+    slotsRef.current.forEach((slot, key) => {
+      slot.grid.copy(slot.home)
+      slot.quaternion.identity()
+      const group = cubieRefs.current.get(key)
+      if (group) {
+        group.position.copy(slot.home).multiplyScalar(SPACING)
+        group.quaternion.identity()
+      }
+    })
+  }, [cubeState])
+
+  const turnRotation = new THREE.Quaternion()
   useFrame((_state, delta) => {
-    if (animationState && animationState.isAnimating && animationState.axis && animationState.affectedCubies && animationState.rotationCenter) {
-      // 更新动画进度
-      const progressDelta = (ANIMATION_SPEED * delta) / Math.abs(animationState.angle)
-      const newProgress = Math.min(animationState.progress + progressDelta, 1)
-      
-      // 计算当前旋转角度
-      const currentAngle = animationState.angle * newProgress
-      
-      const spacing = 1.02
-      const rotationCenter = animationState.rotationCenter
-      
-      // 旋转受影响的 cubies（围绕旋转中心旋转）
-      animationState.affectedCubies.forEach(({ x, y, z }) => {
-        const key = `${x}-${y}-${z}`
-        const cubieGroup = cubieRefs.current.get(key)
-        if (cubieGroup && animationState.axis) {
-          // 计算 cubie 的原始位置
-          const originalPos: [number, number, number] = [x * spacing, y * spacing, z * spacing]
-          
-          // 计算相对于旋转中心的位置
-          const relativePos: [number, number, number] = [
-            originalPos[0] - rotationCenter[0] * spacing,
-            originalPos[1] - rotationCenter[1] * spacing,
-            originalPos[2] - rotationCenter[2] * spacing
-          ]
-          
-          // 创建旋转矩阵
-          const rotationMatrix = new THREE.Matrix4()
-          if (animationState.axis[0] !== 0) {
-            rotationMatrix.makeRotationX(currentAngle)
-          } else if (animationState.axis[1] !== 0) {
-            rotationMatrix.makeRotationY(currentAngle)
-          } else if (animationState.axis[2] !== 0) {
-            rotationMatrix.makeRotationZ(currentAngle)
-          }
-          
-          // 应用旋转
-          const rotatedPos = new THREE.Vector3(...relativePos).applyMatrix4(rotationMatrix)
-          
-          // 计算最终位置（旋转后加回旋转中心）
-          const finalPos: [number, number, number] = [
-            rotatedPos.x + rotationCenter[0] * spacing,
-            rotatedPos.y + rotationCenter[1] * spacing,
-            rotatedPos.z + rotationCenter[2] * spacing
-          ]
-          
-          // 更新位置
-          cubieGroup.position.set(...finalPos)
-          
-          // 应用旋转（让 cubie 本身也旋转，保持方向正确）
-          cubieGroup.rotation.set(0, 0, 0)
-          if (animationState.axis[0] !== 0) {
-            cubieGroup.rotateX(currentAngle)
-          } else if (animationState.axis[1] !== 0) {
-            cubieGroup.rotateY(currentAngle)
-          } else if (animationState.axis[2] !== 0) {
-            cubieGroup.rotateZ(currentAngle)
-          }
-        }
+    const frame = playback.tick(delta)
+    if (frame.completed.length === 0 && !frame.turn) {
+      if (frame.batch) onBatchCompleteRef.current(frame.batch)
+      return
+    }
+
+    // 把转完的步固化到各 cubie 的格坐标与朝向上
+    for (const move of frame.completed) {
+      const turn = describeTurn(move)
+      turnRotation.setFromAxisAngle(AXES[turn.axis], turn.targetAngle)
+      slotsRef.current.forEach((slot) => {
+        if (slot.grid[AXIS_KEYS[turn.axis]] !== turn.layer) return
+        slot.grid.applyQuaternion(turnRotation).round()
+        slot.quaternion.premultiply(turnRotation)
       })
-    } else {
-      // 动画未进行时，确保所有 cubies 位置正确（重置位置）
-      // 这会在动画完成后或没有动画时执行
-      if (!animationState?.isAnimating) {
-        const spacing = 1.02
-        for (let x = -1; x <= 1; x++) {
-          for (let y = -1; y <= 1; y++) {
-            for (let z = -1; z <= 1; z++) {
-              const key = `${x}-${y}-${z}`
-              const cubieGroup = cubieRefs.current.get(key)
-              if (cubieGroup) {
-                // 重置位置和旋转
-                cubieGroup.position.set(x * spacing, y * spacing, z * spacing)
-                cubieGroup.rotation.set(0, 0, 0)
-              }
-            }
-          }
-        }
-      }
     }
+
+    // 当前步：被转动层按当前角度绕轴旋转，其余 cubie 停在固化后的位置
+    const turn = frame.turn
+    if (turn) turnRotation.setFromAxisAngle(AXES[turn.axis], turn.angle)
+    slotsRef.current.forEach((slot, key) => {
+      const group = cubieRefs.current.get(key)
+      if (!group) return
+      group.position.copy(slot.grid).multiplyScalar(SPACING)
+      group.quaternion.copy(slot.quaternion)
+      if (turn && slot.grid[AXIS_KEYS[turn.axis]] === turn.layer) {
+        group.position.applyQuaternion(turnRotation)
+        group.quaternion.premultiply(turnRotation)
+      }
+    })
+
+    if (frame.batch) onBatchCompleteRef.current(frame.batch)
   })
 
   const cubies = []
   const size = 1
-  const spacing = 1.02 // 小块之间的间距
 
-  // 生成27个小块（3x3x3）
+  // 生成 26 个可见小块（3x3x3 去掉中心），group 只创建一次，播放期间直接改变换
   // 坐标系：x向右，y向上，z向前
   // 面索引：U/D: row从上到下(0-2), col从左到右(0-2)
   //        F/B: row从上到下(0-2), col从左到右(0-2) (B面是镜像的)
@@ -113,6 +108,7 @@ export default function RubiksCube({ cubeState, animationState }: RubiksCubeProp
   for (let x = -1; x <= 1; x++) {
     for (let y = -1; y <= 1; y++) {
       for (let z = -1; z <= 1; z++) {
+        if (x === 0 && y === 0 && z === 0) continue
         // 确定这个小块应该在哪些面上显示颜色
         // 将3D坐标转换为面的行列索引
         
@@ -176,17 +172,19 @@ export default function RubiksCube({ cubeState, animationState }: RubiksCubeProp
         }
 
         const cubieKey = `${x}-${y}-${z}`
-        // 计算初始位置（动画期间可能会改变）
-        const initialPos: [number, number, number] = [x * spacing, y * spacing, z * spacing]
+        const slot = slotFor(cubieKey, x, y, z)
         
         cubies.push(
           <group
             key={cubieKey}
             ref={(ref) => {
               if (ref) {
+                if (!cubieRefs.current.has(cubieKey)) {
+                  // 首次挂载时按当前格坐标与朝向摆放
+                  ref.position.copy(slot.grid).multiplyScalar(SPACING)
+                  ref.quaternion.copy(slot.quaternion)
+                }
                 cubieRefs.current.set(cubieKey, ref)
-                // 设置初始位置
-                ref.position.set(...initialPos)
               } else {
                 cubieRefs.current.delete(cubieKey)
               }
@@ -0,0 +1,89 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring, SOLVED_CUBESTRING } from './cubestringCodec'
+import { coalesceMoves, MovePlaybackEngine } from './cubeAnimation'
+
+describe('coalesceMoves', () => {
+  it('merges adjacent same-face turns', () => {
+    expect(coalesceMoves(['R', 'R'])).toEqual(['R2'])
+    expect(coalesceMoves(['R2', 'R'])).toEqual(["R'"])
+    expect(coalesceMoves(['U', "U'", 'F'])).toEqual(['F'])
+    expect(coalesceMoves(['R', 'R', 'R', 'R', 'L'])).toEqual(['L'])
+    expect(coalesceMoves(['R', 'L', 'R'])).toEqual(['R', 'L', 'R'])
+  })
+
+  it('keeps the net effect of a long sequence', () => {
+    const moves: Move[] = ['R', 'R', "U'", 'U2', 'F', "F'", 'F2', 'D', 'B', 'B', "B'", 'L2', 'L2', 'R']
+    const merged = coalesceMoves(moves)
+    expect(merged.length).toBeLessThan(moves.length)
+    expect(applyMovesToCubestring(SOLVED_CUBESTRING, merged)).toBe(
+      applyMovesToCubestring(SOLVED_CUBESTRING, moves)
+    )
+  })
+})
+
+describe('MovePlaybackEngine', () => {
+  it('plays queued moves in order and reports the batch once', () => {
+    const engine = new MovePlaybackEngine({ quarterTurnsPerSecond: 4 })
+    engine.enqueue(['R', "U'"])
+    engine.enqueue(['F2'])
+
+    const first = engine.tick(0.125)
+    expect(first.turn).toMatchObject({ move: 'R', axis: 0, layer: 1 })
+    expect(first.turn!.angle).toBeCloseTo(first.turn!.targetAngle / 2)
+    expect(first.completed).toEqual([])
+    expect(first.batch).toBeNull()
+
+    const second = engine.tick(0.25)
+    expect(second.completed).toEqual(['R'])
+    expect(second.turn?.move).toBe("U'")
+    expect(second.batch).toBeNull()
+
+    // F2 是两个四分之一转，0.5s 才转完
+    const last = engine.tick(1)
+    expect(last.completed).toEqual(["U'", 'F2'])
+    expect(last.turn).toBeNull()
+    expect(last.batch).toEqual(['R', "U'", 'F2'])
+    expect(engine.isIdle).toBe(true)
+    expect(engine.tick(1).batch).toBeNull()
+  })
+
+  it('completes many moves in one frame at high speed', () => {
+    const engine = new MovePlaybackEngine({ quarterTurnsPerSecond: 10_000 })
+    const moves: Move[] = Array.from({ length: 100 }, (_, i) => (['R', 'U', 'F', 'L'] as Move[])[i % 4])
+    engine.enqueue(moves)
+    const frame = engine.tick(1 / 60)
+    expect(frame.batch).toEqual(moves)
+  })
+
+  it('fast-forwards the active turn and the queue on the next tick', () => {
+    const engine = new MovePlaybackEngine({ quarterTurnsPerSecond: 1 })
+    engine.enqueue(['R', 'U', 'U'])
+    engine.tick(0.5)
+    engine.fastForward()
+    const frame = engine.tick(0)
+    expect(frame.completed).toEqual(['R', 'U2'])
+    expect(frame.batch).toEqual(['R', 'U2'])
+    expect(frame.turn).toBeNull()
+  })
+
+  it('reports an empty batch when queued moves cancel out', () => {
+    const engine = new MovePlaybackEngine()
+    engine.enqueue(['R'])
+    engine.enqueue(["R'"])
+    expect(engine.isIdle).toBe(true)
+    const frame = engine.tick(1 / 60)
+    expect(frame.turn).toBeNull()
+    expect(frame.batch).toEqual([])
+    expect(engine.tick(1 / 60).batch).toBeNull()
+  })
+
+  it('keeps the progress ratio when the speed changes mid-turn', () => {
+    const engine = new MovePlaybackEngine({ quarterTurnsPerSecond: 1 })
+    engine.enqueue(['D'])
+    engine.tick(0.5)
+    engine.setSpeed(10)
+    const frame = engine.tick(0.01)
+    expect(frame.turn!.angle / frame.turn!.targetAngle).toBeCloseTo(0.6)
+  })
+})
@@ -1,18 +1,5 @@
 import { Move } from './cubeTypes'
 
-/**
- * 动画类型定义
- */
-export interface AnimationState {
-  isAnimating: boolean
-  move: Move | null
-  progress: number // 0 到 1
-  axis: [number, number, number] | null // 旋转轴
-  angle: number // 目标角度（弧度）
-  affectedCubies: Array<{ x: number; y: number; z: number }> // 需要旋转的 cubies
-  rotationCenter: [number, number, number] | null // 旋转中心
-}
-
 /**
  * 根据移动类型确定需要旋转的 cubies 和旋转轴
  */
@@ -131,14 +118,205 @@ export function getAnimationInfo(move: Move): {
   return { axis, angle, affectedCubies, rotationCenter }
 }
 
+/** 一步转动的四分之一转数（X / X' 为 1，X2 为 2） */
+function quarterTurns(move: Move): number {
+  return move.endsWith('2') ? 2 : 1
+}
+
+/** 同面转动按顺时针四分之一转计数（mod 4）：X = 1，X2 = 2，X' = 3 */
+function clockwiseQuarters(move: Move): number {
+  if (move.endsWith('2')) return 2
+  return move.endsWith("'") ? 3 : 1
+}
+
+function moveFromQuarters(face: string, quarters: number): Move | null {
+  switch (((quarters % 4) + 4) % 4) {
+    case 1:
+      return face as Move
+    case 2:
+      return `${face}2` as Move
+    case 3:
+      return `${face}'` as Move
+    default:
+      return null
+  }
+}
+
 /**
- * 检查一个 cubie 是否在动画中
+ * 合并相邻的同面转动：R R → R2，R2 R → R'，R R' → （抵消）。
+ * 只合并紧邻的同面步，不跨其它面重排，结果与原序列作用相同。
  */
-export function isCubieAffected(
-  cubiePos: { x: number; y: number; z: number },
-  affectedCubies: Array<{ x: number; y: number; z: number }>
-): boolean {
-  return affectedCubies.some(
-    pos => pos.x === cubiePos.x && pos.y === cubiePos.y && pos.z === cubiePos.z
-  )
+export function coalesceMoves(moves: readonly Move[]): Move[] {
+  const out: Move[] = []
+  for (const move of moves) {
+    const last = out[out.length - 1]
+    if (last && last[0] === move[0]) {
+      out.pop()
+      const merged = moveFromQuarters(move[0], clockwiseQuarters(last) + clockwiseQuarters(move))
+      if (merged) out.push(merged)
+    } else {
+      out.push(move)
+    }
+  }
+  return out
+}
+
+/** 正在播放的一步 */
+export interface PlaybackTurn {
+  move: Move
+  /** 旋转轴：0 = x，1 = y，2 = z */
+  axis: 0 | 1 | 2
+  /** 被转动层在该轴上的坐标 */
+  layer: 1 | -1
+  /** 当前已转过的角度（弧度，符号约定与 getAnimationInfo 一致） */
+  angle: number
+  /** 本步的目标角度 */
+  targetAngle: number
+}
+
+/** tick 的输出：渲染层据此更新变换，应用层据此提交状态 */
+export interface PlaybackFrame {
+  turn: PlaybackTurn | null
+  /** 本帧内转完的步（按顺序），渲染层据此把旋转固化到 cubie 变换上 */
+  completed: Move[]
+  /**
+   * 队列在本帧排空时，为本批已完成的全部步（应用层一次性提交）；否则为 null。
+   * 入队的步合并抵消为空（如 R 后接 R'）时为空数组，应用层同样据此结束本批。
+   */
+  batch: Move[] | null
+}
+
+export interface MovePlaybackOptions {
+  /** 播放速度：每秒四分之一转数，默认 4 */
+  quarterTurnsPerSecond?: number
+}
+
+type ActiveTurn = Omit<PlaybackTurn, 'angle'> & { elapsed: number; duration: number }
+
+/** 一步转动的轴、层与目标角度（渲染层固化已完成的步时使用） */
+export function describeTurn(move: Move): Omit<PlaybackTurn, 'angle'> {
+  const { axis, angle, rotationCenter } = getAnimationInfo(move)
+  const axisIndex = axis[0] !== 0 ? 0 : axis[1] !== 0 ? 1 : 2
+  return {
+    move,
+    axis: axisIndex,
+    layer: rotationCenter[axisIndex] > 0 ? 1 : -1,
+    targetAngle: angle,
+  }
+}
+
+/**
+ * 与 React 无关的帧驱动播放队列。
+ * 调用方每帧调用 tick(delta)；入队的步一律按序播放（不会因动画进行中被丢弃），
+ * 相邻同面步在入队时合并，整批播放完毕才通过 batch 交出一次性提交的步序列。
+ */
+export class MovePlaybackEngine {
+  private queue: Move[] = []
+  private active: ActiveTurn | null = null
+  private batch: Move[] = []
+  /** 自上次交出 batch 以来有步入队；即使入队的步合并抵消为空，也要交出一次（空）batch */
+  private batchOpen = false
+  private fastForwardRequested = false
+  private quarterTurnsPerSecond: number
+
+  constructor(options: MovePlaybackOptions = {}) {
+    this.quarterTurnsPerSecond = options.quarterTurnsPerSecond ?? 4
+  }
+
+  get speed(): number {
+    return this.quarterTurnsPerSecond
+  }
+
+  /** 修改播放速度，立即作用于正在播放的步（保持已转过的比例） */
+  setSpeed(quarterTurnsPerSecond: number): void {
+    if (!(quarterTurnsPerSecond > 0)) return
+    if (this.active) {
+      const ratio = this.active.elapsed / this.active.duration
+      this.active.duration = quarterTurns(this.active.move) / quarterTurnsPerSecond
+      this.active.elapsed = ratio * this.active.duration
+    }
+    this.quarterTurnsPerSecond = quarterTurnsPerSecond
+  }
+
+  /** 队列与当前步都为空 */
+  get isIdle(): boolean {
+    return !this.active && this.queue.length === 0
+  }
+
+  /** 尚未开始播放的步数（合并后） */
+  get pendingCount(): number {
+    return this.queue.length
+  }
+
+  enqueue(moves: readonly Move[]): void {
+    if (moves.length > 0) this.batchOpen = true
+    // 只与队列内合并，不与正在转的步合并，避免已转过的角度回退
+    this.queue = coalesceMoves([...this.queue, ...moves])
+  }
+
+  /** 下一次 tick 时直接完成当前步与队列中的所有步 */
+  fastForward(): void {
+    if (!this.isIdle) this.fastForwardRequested = true
+  }
+
+  /** 丢弃尚未开始的步；当前步仍会转完 */
+  clearPending(): void {
+    this.queue = []
+  }
+
+  tick(deltaSeconds: number): PlaybackFrame {
+    const completed: Move[] = []
+
+    if (this.fastForwardRequested) {
+      this.fastForwardRequested = false
+      if (this.active) completed.push(this.active.move)
+      completed.push(...this.queue)
+      this.active = null
+      this.queue = []
+    } else {
+      let remaining = Math.max(0, deltaSeconds)
+      while (true) {
+        if (!this.active) {
+          const next = this.queue.shift()
+          if (!next) break
+          this.active = this.startTurn(next)
+        }
+        const left = this.active.duration - this.active.elapsed
+        if (remaining < left) {
+          this.active.elapsed += remaining
+          break
+        }
+        remaining -= left
+        completed.push(this.active.move)
+        this.active = null
+      }
+    }
+
+    this.batch.push(...completed)
+    let batch: Move[] | null = null
+    if (this.batchOpen && this.isIdle) {
+      batch = this.batch
+      this.batch = []
+      this.batchOpen = false
+    }
+
+    const turn = this.active
+      ? {
+          move: this.active.move,
+          axis: this.active.axis,
+          layer: this.active.layer,
+          targetAngle: this.active.targetAngle,
+          angle: this.active.targetAngle * (this.active.elapsed / this.active.duration),
+        }
+      : null
+    return { turn, completed, batch }
+  }
+
+  private startTurn(move: Move): ActiveTurn {
+    return {
+      ...describeTurn(move),
+      elapsed: 0,
+      duration: quarterTurns(move) / this.quarterTurnsPerSecond,
+    }
+  }
 }
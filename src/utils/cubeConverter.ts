@@ -2,7 +2,6 @@ import { Move, CubieBasedCubeState } from './cubeTypes'
 import { cubieBasedStateToFaceColors } from './cubieBasedCubeLogic'
 import { createSolvedCubieBasedCube } from './cubieBasedCubeLogic'
 import { CubeState } from './cubeTypes'
-import { solve as kociembaWasmSolve } from 'kociemba-wasm'
 
 // 将 CubeState 转换为 Kociemba 算法需要的 cubestring 格式
 // 格式: UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB
@@ -209,7 +208,8 @@ export async function solveCube(cubieBasedState: CubieBasedCubeState, _movesToSt
     }
     
     // 使用 Kociemba 算法求解
-    // kociemba-wasm 支持 cubestring 格式（54 字符）
+    // kociemba-wasm 支持 cubestring 格式（54 字符）；按需加载，编解码路径不引入 wasm 分块
+    const { solve: kociembaWasmSolve } = await import('kociemba-wasm')
     const solutionString = await kociembaWasmSolve(cubestring)
     console.log('Kociemba 求解结果（原始字符串）:', solutionString)
     
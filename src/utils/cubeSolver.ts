@@ -3,18 +3,19 @@ import { createSolvedCubieBasedCube, applyMove, cubieBasedStateToFaceColors } fr
 import {
   cubeStateToKeyString,
   cubeStatesEqual,
-  manhattanSums,
+  heuristicFromPieceCounters,
+  pieceHeuristicCounters,
+  pieceHeuristicCountersAfterMove,
+  type PieceHeuristicCounters,
 } from './idaStarHelpers'
 import {
-  solveByPhasedIDAStar,
-  solveByThistlethwaite as thistlethwaiteSolve,
-} from './thistlethwaite'
-import {
+  applyMovesToCubestring,
   cubieFromCubestring,
   cubieBasedStateToCanonicalCubestring,
   SOLVED_CUBESTRING,
 } from './cubestringCodec'
 import type { ThistlethwaiteSearchTuning } from './thistlethwaite'
+import { getShallowSolutionTable, lookupShallowSolution } from './shallowSolutionTable'
 
 // 求解算法类型
 export type SolverAlgorithm = 'kociemba' | 'ida-star' | 'reverse-moves' | 'thistlethwaite'
@@ -214,62 +215,16 @@ export async function solveByIDAStar(
   
   let nodeCount = 0
 
-  // 启发式：取「错块数/4」与坐标 Manhattan 下界的 max。
-  // 在当前 HTM move set 中，R2/F2 等半转算一步；一次半转最多可让 4 个角块各减少 4 格
-  // Manhattan（合计 16），棱块最多合计约 8，因此不能用 /4，否则会高估并破坏 IDA* 完备性。
-  function heuristic(state: CubieBasedCubeState): number {
-    let cornerWrong = 0
-    let edgeWrong = 0
-    const solved = solvedState
-
-    for (const [id, corner] of Object.entries(state.corners)) {
-      const solvedCorner = solved.corners[id as keyof typeof solved.corners]
-      const posMatch =
-        corner.coordinate[0] === solvedCorner.coordinate[0] &&
-        corner.coordinate[1] === solvedCorner.coordinate[1] &&
-        corner.coordinate[2] === solvedCorner.coordinate[2]
-      if (!posMatch) {
-        cornerWrong++
-      } else {
-        const c = corner.colors
-        const s = solvedCorner.colors
-        if (c.upper !== s.upper || c.down !== s.down || c.front !== s.front ||
-            c.back !== s.back || c.left !== s.left || c.right !== s.right) {
-          cornerWrong++
-        }
-      }
-    }
-
-    for (const [id, edge] of Object.entries(state.edges)) {
-      const solvedEdge = solved.edges[id as keyof typeof solved.edges]
-      const posMatch =
-        edge.coordinate[0] === solvedEdge.coordinate[0] &&
-        edge.coordinate[1] === solvedEdge.coordinate[1] &&
-        edge.coordinate[2] === solvedEdge.coordinate[2]
-      if (!posMatch) {
-        edgeWrong++
-      } else {
-        const c = edge.colors
-        const s = solvedEdge.colors
-        if (c.upper !== s.upper || c.down !== s.down || c.front !== s.front ||
-            c.back !== s.back || c.left !== s.left || c.right !== s.right) {
-          edgeWrong++
-        }
-      }
-    }
-
-    const hWrong = Math.max(Math.ceil(cornerWrong / 4), Math.ceil(edgeWrong / 4))
-    const { sumCorner, sumEdge } = manhattanSums(state, solved)
-    const hMan = Math.max(Math.ceil(sumCorner / 16), Math.ceil(sumEdge / 8))
-    return Math.max(hWrong, hMan)
-  }
+  // 启发式：取「错块数/4」与坐标 Manhattan 下界的 max（见 heuristicFromPieceCounters）。
+  // 计数沿搜索栈增量维护：经槽位索引只读被转动层的 4 角 4 棱，不再全量扫描 20 块。
+  const initialCounters = pieceHeuristicCounters(cubieBasedState, solvedState)
 
   /** 使用已算好的面颜色，避免在 isSolved 里重复 cubieBasedStateToFaceColors */
   function isSolvedFaceColors(faceColors: CubeState): boolean {
     return cubeStatesEqual(faceColors, solvedCubeState)
   }
 
-  const initialH = heuristic(cubieBasedState)
+  const initialH = heuristicFromPieceCounters(initialCounters)
   log('开始求解', {
     maxDepth,
     maxNodes,
@@ -288,6 +243,7 @@ export async function solveByIDAStar(
   // IDA* 搜索（path 可变数组 + push/pop；异步 yield 保持页面可响应）
   async function search(
     state: CubieBasedCubeState,
+    counters: PieceHeuristicCounters,
     path: Move[],
     g: number,
     threshold: number
@@ -320,7 +276,7 @@ export async function solveByIDAStar(
     }
 
     const faceColors = cubieBasedStateToFaceColors(state)
-    const h = heuristic(state)
+    const h = heuristicFromPieceCounters(counters)
     const f = g + h
 
     if (DEBUG && nodeCount % IDA_STAR_DEBUG_PROGRESS_NODES === 0) {
@@ -391,8 +347,15 @@ export async function solveByIDAStar(
       }
       
       const newState = applyMove(state, move)
+      const newCounters = pieceHeuristicCountersAfterMove(
+        counters,
+        state,
+        newState,
+        solvedState,
+        move
+      )
       path.push(move)
-      const result = await search(newState, path, g + 1, threshold)
+      const result = await search(newState, newCounters, path, g + 1, threshold)
       path.pop()
       
       if (result.found) {
@@ -419,7 +382,7 @@ export async function solveByIDAStar(
     const tRound = typeof performance !== 'undefined' ? performance.now() : Date.now()
     log('迭代加深轮次开始', { idaRound, threshold, maxDepth })
 
-    const result = await search(cubieBasedState, [], 0, threshold)
+    const result = await search(cubieBasedState, initialCounters, [], 0, threshold)
 
     const roundMs = Math.round(
       (typeof performance !== 'undefined' ? performance.now() : Date.now()) - tRound
@@ -493,6 +456,55 @@ export async function solveByCubeSolverKociemba(cubestring: string): Promise<Mov
   }
 }
 
+export type SolverWarmupOptions = {
+  /** 表构建的启动成本预算（毫秒），超出后不再开始构建下一张表；0 或不传表示不限 */
+  budgetMs?: number
+}
+
+/**
+ * 预热指定算法：加载其代码分块并提前构建抽象表，供服务/页面在空闲时付出首解成本。
+ * 不调用时一切仍按需懒加载；编解码与校验路径不会触发任何求解器表。
+ */
+export async function warmupSolver(
+  algorithm: SolverAlgorithm,
+  options?: SolverWarmupOptions
+): Promise<void> {
+  switch (algorithm) {
+    case 'ida-star':
+    case 'thistlethwaite': {
+      const { warmupThistlethwaiteTables } = await import('./thistlethwaite')
+      const ready = await warmupThistlethwaiteTables({ budgetMs: options?.budgetMs })
+      console.log(`求解器预热（${algorithm}）：已就绪表 ${ready.join(', ') || '无'}`)
+      return
+    }
+    case 'kociemba': {
+      // kociemba-wasm 在首次求解时初始化 wasm 与内部表，用单步状态付出这部分成本
+      const { solve } = await import('kociemba-wasm')
+      await solve(applyMovesToCubestring(SOLVED_CUBESTRING, ['R']))
+      return
+    }
+    case 'reverse-moves':
+    default:
+      return
+  }
+}
+
+/**
+ * 若已注册浅层解表（见 shallowSolutionTable.ts）且状态在表内，直接返回查表得到的最优解
+ */
+function solveFromShallowTable(cubieBasedState: CubieBasedCubeState): Move[] | null {
+  const table = getShallowSolutionTable()
+  if (!table) {
+    return null
+  }
+  const cubestring = cubieBasedStateToCanonicalCubestring(cubieBasedState)
+  const moves = lookupShallowSolution(table, cubestring)
+  if (moves && applyMovesToCubestring(cubestring, moves) === SOLVED_CUBESTRING) {
+    return moves
+  }
+  return null
+}
+
 /**
  * 主求解函数，支持多种算法
  */
@@ -502,6 +514,14 @@ export async function solveCube(
   movesToState?: Move[]
 ): Promise<Move[]> {
   try {
+    // 浅层状态先查表，命中则跳过任何搜索（reverse-moves 按约定只反转历史）
+    if (algorithm !== 'reverse-moves') {
+      const tableSolution = solveFromShallowTable(cubieBasedState)
+      if (tableSolution) {
+        return tableSolution
+      }
+    }
+
     switch (algorithm) {
       case 'reverse-moves':
         // 如果知道打乱序列，直接反向
@@ -535,6 +555,7 @@ export async function solveCube(
           }
         }
 
+        const { solveByPhasedIDAStar } = await import('./thistlethwaite')
         const phasedSolution = await solveByPhasedIDAStar(cubie, IDA_STAR_PHASED_UI_TUNING)
         if (phasedSolution.length > 0 && solutionRestoresState(cubie, phasedSolution)) {
           return phasedSolution
@@ -555,6 +576,7 @@ export async function solveCube(
           }
 
           try {
+            const { solveByThistlethwaite: thistlethwaiteSolve } = await import('./thistlethwaite')
             const thistleSolution = await thistlethwaiteSolve(
               cubie,
               8,
@@ -0,0 +1,81 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring, cubestringToCubeState, SOLVED_CUBESTRING } from './cubestringCodec'
+import { createSolvedCubieBasedCube, cubieBasedStateToFaceColors } from './cubieBasedCubeLogic'
+import { faceColorsToCubieBasedState, faceColorsToCubieBasedStates } from './faceColorsToCubieBased'
+import {
+  CORNER_COLORS,
+  CORNER_LOOKUP,
+  CORNER_MIRRORED,
+  EDGE_COLORS,
+  EDGE_LOOKUP,
+  cornerColorKey,
+  edgeColorKey,
+} from './faceletTables'
+
+const SCRAMBLED = applyMovesToCubestring(SOLVED_CUBESTRING, [
+  'R', "U'", 'F2', 'D', 'L2', 'B', "R'", 'U2', 'F', "D'", 'L', 'B2',
+] as Move[])
+
+function withStickers(cubestring: string, changes: Record<number, string>): string {
+  return [...cubestring].map((c, i) => changes[i] ?? c).join('')
+}
+
+describe('facelet lookup tables', () => {
+  it('maps every piece orientation and mirror to its piece', () => {
+    CORNER_COLORS.forEach(([a, b, c], piece) => {
+      expect(CORNER_LOOKUP[cornerColorKey(a, b, c)]).toBe(piece * 4)
+      expect(CORNER_LOOKUP[cornerColorKey(c, a, b)]).toBe(piece * 4 + 1)
+      expect(CORNER_LOOKUP[cornerColorKey(b, c, a)]).toBe(piece * 4 + 2)
+      for (const key of [cornerColorKey(a, c, b), cornerColorKey(b, a, c), cornerColorKey(c, b, a)]) {
+        expect(CORNER_LOOKUP[key]).toBe(piece * 4 + CORNER_MIRRORED)
+      }
+    })
+    EDGE_COLORS.forEach(([a, b], piece) => {
+      expect(EDGE_LOOKUP[edgeColorKey(a, b)]).toBe(piece * 2)
+      expect(EDGE_LOOKUP[edgeColorKey(b, a)]).toBe(piece * 2 + 1)
+    })
+    expect(CORNER_LOOKUP.filter((v) => v >= 0)).toHaveLength(48)
+    expect(EDGE_LOOKUP.filter((v) => v >= 0)).toHaveLength(24)
+  })
+})
+
+describe('faceColorsToCubieBasedState', () => {
+  it('converts the solved cube to the solved cubie state', () => {
+    expect(faceColorsToCubieBasedState(cubestringToCubeState(SOLVED_CUBESTRING))).toEqual(
+      createSolvedCubieBasedCube()
+    )
+  })
+
+  it('round-trips scrambled states through cubieBasedStateToFaceColors', () => {
+    const cubeState = cubestringToCubeState(SCRAMBLED)
+    expect(cubieBasedStateToFaceColors(faceColorsToCubieBasedState(cubeState))).toEqual(cubeState)
+  })
+
+  it('matches corners by color set, as before', () => {
+    // URF 角块后两个贴纸互换：手性相反，颜色集合仍是 URF
+    const mirrored = withStickers(SOLVED_CUBESTRING, { 9: 'F', 20: 'R' })
+    const state = faceColorsToCubieBasedState(cubestringToCubeState(mirrored))
+    expect(state.corners.UFR.colors).toMatchObject({ upper: 'white', right: 'red', front: 'blue' })
+  })
+
+  it('reports the first slot whose colors match no unused piece', () => {
+    // UF 与 UB 都读成白-红：UB 槽位的块重复
+    const duplicated = withStickers(SOLVED_CUBESTRING, { 46: 'F', 25: 'B' })
+    expect(() => faceColorsToCubieBasedState(cubestringToCubeState(duplicated))).toThrow(
+      'Invalid edge cubie at [0, 1, -1]: U:white, B:red'
+    )
+  })
+
+  it('converts a batch without stopping at invalid entries', () => {
+    const bad = withStickers(SOLVED_CUBESTRING, { 0: 'R', 9: 'U' })
+    const { states, errors, failed } = faceColorsToCubieBasedStates(
+      [SCRAMBLED, bad, SOLVED_CUBESTRING].map(cubestringToCubeState)
+    )
+    expect(failed).toBe(1)
+    expect(states[0]).toEqual(faceColorsToCubieBasedState(cubestringToCubeState(SCRAMBLED)))
+    expect(states[1]).toBeNull()
+    expect(errors[1]).toMatch(/^Invalid corner cubie/)
+    expect(states[2]).toEqual(createSolvedCubieBasedCube())
+  })
+})
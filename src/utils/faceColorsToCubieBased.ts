@@ -1,11 +1,21 @@
 /**
  * 从面颜色数组（CubeState）转换为 CubieBasedCubeState
- * 
- * 这个函数通过分析每个面的颜色，推断每个 cubie 的位置和方向
+ *
+ * 每个角块 / 棱块槽位的贴纸位置是固定的（见 faceletTables.ts），
+ * 块的识别只需把槽位上的颜色编码成整数再查一次表，不再逐个比对已还原状态中的块。
  */
 
-import { CubeState, CubieBasedCubeState, FaceColor, CornerCubieId, EdgeCubieId, FaceCubieId, CubieColors } from './cubeTypes'
+import { CubeState, CubieBasedCubeState, FaceColor, CornerCubie, EdgeCubie, FaceCubie, Face, CubieColors } from './cubeTypes'
 import { createSolvedCubieBasedCube } from './cubieBasedCubeLogic'
+import {
+  CORNER_FACELETS,
+  CORNER_LOOKUP,
+  EDGE_FACELETS,
+  EDGE_LOOKUP,
+  FACELET_FACES,
+  cornerColorKey,
+  edgeColorKey,
+} from './faceletTables'
 
 const FACE_ORDER = ['U', 'D', 'F', 'B', 'L', 'R'] as const
 const STICKER_COLORS: FaceColor[] = ['white', 'yellow', 'red', 'orange', 'green', 'blue']
@@ -18,6 +28,76 @@ const EXPECTED_CENTER_COLORS: Record<(typeof FACE_ORDER)[number], FaceColor> = {
   R: 'blue',
 }
 
+/** 颜色 → 面序号（FACELET_FACES 下标）；以及反查 */
+const COLOR_INDEX = new Map<FaceColor, number>(
+  FACELET_FACES.map((face, index) => [EXPECTED_CENTER_COLORS[face], index])
+)
+const INDEX_COLOR: FaceColor[] = FACELET_FACES.map(face => EXPECTED_CENTER_COLORS[face])
+/** 魔方的面 → cubie 上对应的表面 */
+const CUBIE_SIDE: Record<Face, keyof CubieColors> = {
+  U: 'upper',
+  D: 'down',
+  F: 'front',
+  B: 'back',
+  L: 'left',
+  R: 'right',
+}
+/** 报错信息中贴纸的列出顺序（与原先逐槽位列出的顺序一致） */
+const MESSAGE_FACE_ORDER = 'UDFBRL'
+
+/** 一个角块 / 棱块槽位：贴纸下标、在 cubie 上的表面、坐标 */
+interface SlotSpec {
+  facelets: readonly number[]
+  sides: (keyof CubieColors)[]
+  coordinate: [number, number, number]
+  /** 报错信息中 facelets 的列出顺序 */
+  messageOrder: number[]
+}
+
+function faceOfFacelet(index: number): Face {
+  return FACELET_FACES[Math.floor(index / 9)]
+}
+
+function createSlot(facelets: readonly number[]): SlotSpec {
+  const faces = facelets.map(faceOfFacelet)
+  const coordinate: [number, number, number] = [0, 0, 0]
+  for (const face of faces) {
+    if (face === 'R') coordinate[0] = 1
+    else if (face === 'L') coordinate[0] = -1
+    else if (face === 'U') coordinate[1] = 1
+    else if (face === 'D') coordinate[1] = -1
+    else if (face === 'F') coordinate[2] = 1
+    else coordinate[2] = -1
+  }
+  return {
+    facelets,
+    sides: faces.map(face => CUBIE_SIDE[face]),
+    coordinate,
+    messageOrder: facelets
+      .map((_, k) => k)
+      .sort((a, b) => MESSAGE_FACE_ORDER.indexOf(faces[a]) - MESSAGE_FACE_ORDER.indexOf(faces[b])),
+  }
+}
+
+const SOLVED = createSolvedCubieBasedCube()
+const sameCoordinate = (a: readonly number[], b: readonly number[]) => a.every((v, i) => v === b[i])
+
+/** 角块槽位按 Kociemba 顺序（与原先的处理顺序 UFR UFL UBL UBR DFR DFL DBL DBR 相同） */
+const CORNER_SLOTS = CORNER_FACELETS.map(createSlot)
+/** 块序号（查找表中的 piece）→ 已还原状态中位于该槽位的块 id */
+const CORNER_PIECE_IDS = CORNER_SLOTS.map(
+  slot => Object.values(SOLVED.corners).find(c => sameCoordinate(c.coordinate, slot.coordinate))!.id
+)
+const EDGE_PIECE_SLOTS = EDGE_FACELETS.map(createSlot)
+const EDGE_PIECE_IDS = EDGE_PIECE_SLOTS.map(
+  slot => Object.values(SOLVED.edges).find(e => sameCoordinate(e.coordinate, slot.coordinate))!.id
+)
+/** 棱块槽位的处理顺序沿用原实现（UF UR UB UL DF DR DB DL FR FL BR BL），保证多处错误时报出同一个槽位 */
+const EDGE_SLOTS = Object.values(SOLVED.edges).map(
+  edge => EDGE_PIECE_SLOTS.find(slot => sameCoordinate(slot.coordinate, edge.coordinate))!
+)
+const FACE_TEMPLATES: FaceCubie[] = Object.values(SOLVED.faces)
+
 function createBlackCubieColors(): CubieColors {
   return {
     upper: 'black',
@@ -29,11 +109,11 @@ function createBlackCubieColors(): CubieColors {
   }
 }
 
-function validateCubeState(cubeState: CubeState): void {
-  const counts = new Map<FaceColor, number>()
-  for (const color of STICKER_COLORS) {
-    counts.set(color, 0)
-  }
+/**
+ * 校验 CubeState 并按 Kociemba 下标把颜色序号写入 out（长度 54）
+ */
+function readFacelets(cubeState: CubeState, out: Int8Array): void {
+  const counts = new Int32Array(FACELET_FACES.length)
 
   for (const face of FACE_ORDER) {
     const grid = cubeState[face]
@@ -46,434 +126,120 @@ function validateCubeState(cubeState: CubeState): void {
       throw new Error(`Invalid ${face} center: expected ${EXPECTED_CENTER_COLORS[face]}, got ${center}`)
     }
 
-    for (const row of grid) {
-      for (const color of row) {
-        if (!STICKER_COLORS.includes(color)) {
+    const base = FACELET_FACES.indexOf(face) * 9
+    for (let row = 0; row < 3; row++) {
+      for (let col = 0; col < 3; col++) {
+        const color = grid[row][col]
+        const index = COLOR_INDEX.get(color)
+        if (index === undefined) {
           throw new Error(`Invalid cube color: ${color}`)
         }
-        counts.set(color, (counts.get(color) ?? 0) + 1)
+        out[base + row * 3 + col] = index
+        counts[index]++
       }
     }
   }
 
   for (const color of STICKER_COLORS) {
-    const count = counts.get(color) ?? 0
+    const count = counts[COLOR_INDEX.get(color)!]
     if (count !== 9) {
       throw new Error(`Invalid cube color count for ${color}: expected 9, got ${count}`)
     }
   }
 }
 
-function sameColorSet(a: FaceColor[], b: FaceColor[]): boolean {
-  if (a.length !== b.length) return false
-  const aa = [...a].sort()
-  const bb = [...b].sort()
-  return aa.every((color, index) => color === bb[index])
-}
-
-function formatFaceColors(faceColors: Record<string, FaceColor | undefined>): string {
-  return Object.entries(faceColors)
-    .filter(([, color]) => color !== undefined)
-    .map(([face, color]) => `${face}:${color}`)
+function formatSlotColors(slot: SlotSpec, facelets: Int8Array): string {
+  return slot.messageOrder
+    .map(k => `${faceOfFacelet(slot.facelets[k])}:${INDEX_COLOR[facelets[slot.facelets[k]]]}`)
     .join(', ')
 }
 
-/**
- * 从 CubeState 创建 CubieBasedCubeState
- * 
- * 算法思路：
- * 1. 首先识别中心块的颜色，确定每个面的标准颜色
- * 2. 对于每个角块位置，查找匹配该位置颜色的角块
- * 3. 对于每个边块位置，查找匹配该位置颜色的边块
- * 4. 确定每个 cubie 的方向（颜色朝向）
- */
-export function faceColorsToCubieBasedState(cubeState: CubeState): CubieBasedCubeState {
-  validateCubeState(cubeState)
-
-  // 创建已解决状态作为基础
-  const solved = createSolvedCubieBasedCube()
-  const result: CubieBasedCubeState = {
-    corners: {} as Record<CornerCubieId, typeof solved.corners[CornerCubieId]>,
-    edges: {} as Record<EdgeCubieId, typeof solved.edges[EdgeCubieId]>,
-    faces: {} as Record<FaceCubieId, typeof solved.faces[FaceCubieId]>,
-  }
-
-  // 设置中心块（根据识别的颜色）
-  for (const [faceId, face] of Object.entries(solved.faces)) {
-    const [x, y, z] = face.coordinate
-    let detectedColor: FaceColor = face.color
-    
-    // 根据坐标确定是哪个面，读取中心块颜色
-    if (y === 1) detectedColor = cubeState.U[1][1]
-    else if (y === -1) detectedColor = cubeState.D[1][1]
-    else if (z === 1) detectedColor = cubeState.F[1][1]
-    else if (z === -1) detectedColor = cubeState.B[1][1]
-    else if (x === 1) detectedColor = cubeState.R[1][1]
-    else if (x === -1) detectedColor = cubeState.L[1][1]
-    
-    result.faces[faceId as FaceCubieId] = {
-      ...face,
-      color: detectedColor,
-    }
-  }
-
-  // 处理角块：对于每个角块位置，找到匹配的角块
-  // 根据 cubieBasedStateToFaceColors 的映射：
-  // U面: row = z+1, col = x+1
-  // D面: row = 1-z, col = x+1
-  // F面: row = 1-y, col = x+1
-  // B面: row = 1-y, col = 1-x
-  // R面: row = 1-y, col = 1-z
-  // L面: row = 1-y, col = z+1
-  const cornerPositions: Array<{ 
-    coord: [number, number, number], 
-    faceColors: { U?: FaceColor, D?: FaceColor, F?: FaceColor, B?: FaceColor, R?: FaceColor, L?: FaceColor }
-  }> = [
-    // UFR: [1, 1, 1]
-    { 
-      coord: [1, 1, 1], 
-      faceColors: {
-        U: cubeState.U[1 + 1][1 + 1], // row=z+1=2, col=x+1=2
-        F: cubeState.F[1 - 1][1 + 1], // row=1-y=0, col=x+1=2
-        R: cubeState.R[1 - 1][1 - 1], // row=1-y=0, col=1-z=0
-      }
-    },
-    // UFL: [-1, 1, 1]
-    { 
-      coord: [-1, 1, 1], 
-      faceColors: {
-        U: cubeState.U[1 + 1][-1 + 1], // row=z+1=2, col=x+1=0
-        F: cubeState.F[1 - 1][-1 + 1], // row=1-y=0, col=x+1=0
-        L: cubeState.L[1 - 1][1 + 1], // row=1-y=0, col=z+1=2
-      }
-    },
-    // UBL: [-1, 1, -1]
-    { 
-      coord: [-1, 1, -1], 
-      faceColors: {
-        U: cubeState.U[-1 + 1][-1 + 1], // row=z+1=0, col=x+1=0
-        B: cubeState.B[1 - 1][1 - (-1)], // row=1-y=0, col=1-x=2
-        L: cubeState.L[1 - 1][-1 + 1], // row=1-y=0, col=z+1=0
-      }
-    },
-    // UBR: [1, 1, -1]
-    { 
-      coord: [1, 1, -1], 
-      faceColors: {
-        U: cubeState.U[-1 + 1][1 + 1], // row=z+1=0, col=x+1=2
-        B: cubeState.B[1 - 1][1 - 1], // row=1-y=0, col=1-x=0
-        R: cubeState.R[1 - 1][1 - (-1)], // row=1-y=0, col=1-z=2
-      }
-    },
-    // DFR: [1, -1, 1]
-    { 
-      coord: [1, -1, 1], 
-      faceColors: {
-        D: cubeState.D[1 - 1][1 + 1], // row=1-z=0, col=x+1=2
-        F: cubeState.F[1 - (-1)][1 + 1], // row=1-y=2, col=x+1=2
-        R: cubeState.R[1 - (-1)][1 - 1], // row=1-y=2, col=1-z=0
-      }
-    },
-    // DFL: [-1, -1, 1]
-    { 
-      coord: [-1, -1, 1], 
-      faceColors: {
-        D: cubeState.D[1 - 1][-1 + 1], // row=1-z=0, col=x+1=0
-        F: cubeState.F[1 - (-1)][-1 + 1], // row=1-y=2, col=x+1=0
-        L: cubeState.L[1 - (-1)][1 + 1], // row=1-y=2, col=z+1=2
-      }
-    },
-    // DBL: [-1, -1, -1]
-    { 
-      coord: [-1, -1, -1], 
-      faceColors: {
-        D: cubeState.D[1 - (-1)][-1 + 1], // row=1-z=2, col=x+1=0
-        B: cubeState.B[1 - (-1)][1 - (-1)], // row=1-y=2, col=1-x=2
-        L: cubeState.L[1 - (-1)][-1 + 1], // row=1-y=2, col=z+1=0
-      }
-    },
-    // DBR: [1, -1, -1]
-    { 
-      coord: [1, -1, -1], 
-      faceColors: {
-        D: cubeState.D[1 - (-1)][1 + 1], // row=1-z=2, col=x+1=2
-        B: cubeState.B[1 - (-1)][1 - 1], // row=1-y=2, col=1-x=0
-        R: cubeState.R[1 - (-1)][1 - (-1)], // row=1-y=2, col=1-z=2
-      }
-    },
-  ]
-
-  // 为每个位置找到匹配的角块
-  for (const pos of cornerPositions) {
-    const targetColors = Object.values(pos.faceColors).filter(c => c !== undefined) as FaceColor[]
-    const matchingCorner = findMatchingCorner(targetColors, solved.corners, result.corners)
-    if (!matchingCorner) {
-      throw new Error(`Invalid corner cubie at [${pos.coord.join(', ')}]: ${formatFaceColors(pos.faceColors)}`)
-    }
-
-    result.corners[matchingCorner.id] = {
-      ...matchingCorner,
-      coordinate: pos.coord,
-      colors: adjustCornerColors(pos.faceColors, pos.coord),
-    }
+function slotColors(slot: SlotSpec, facelets: Int8Array): CubieColors {
+  const colors = createBlackCubieColors()
+  for (let k = 0; k < slot.facelets.length; k++) {
+    colors[slot.sides[k]] = INDEX_COLOR[facelets[slot.facelets[k]]]
   }
+  return colors
+}
 
-  // 处理边块：对于每个边块位置，找到匹配的边块
-  const edgePositions: Array<{ 
-    coord: [number, number, number], 
-    faceColors: { U?: FaceColor, D?: FaceColor, F?: FaceColor, B?: FaceColor, R?: FaceColor, L?: FaceColor }
-  }> = [
-    // UF: [0, 1, 1]
-    { 
-      coord: [0, 1, 1], 
-      faceColors: {
-        U: cubeState.U[1 + 1][0 + 1], // row=z+1=2, col=x+1=1
-        F: cubeState.F[1 - 1][0 + 1], // row=1-y=0, col=x+1=1
-      }
-    },
-    // UR: [1, 1, 0]
-    { 
-      coord: [1, 1, 0], 
-      faceColors: {
-        U: cubeState.U[0 + 1][1 + 1], // row=z+1=1, col=x+1=2
-        R: cubeState.R[1 - 1][1 - 0], // row=1-y=0, col=1-z=1
-      }
-    },
-    // UB: [0, 1, -1]
-    { 
-      coord: [0, 1, -1], 
-      faceColors: {
-        U: cubeState.U[-1 + 1][0 + 1], // row=z+1=0, col=x+1=1
-        B: cubeState.B[1 - 1][1 - 0], // row=1-y=0, col=1-x=1
-      }
-    },
-    // UL: [-1, 1, 0]
-    { 
-      coord: [-1, 1, 0], 
-      faceColors: {
-        U: cubeState.U[0 + 1][-1 + 1], // row=z+1=1, col=x+1=0
-        L: cubeState.L[1 - 1][0 + 1], // row=1-y=0, col=z+1=1
-      }
-    },
-    // DF: [0, -1, 1]
-    { 
-      coord: [0, -1, 1], 
-      faceColors: {
-        D: cubeState.D[1 - 1][0 + 1], // row=1-z=0, col=x+1=1
-        F: cubeState.F[1 - (-1)][0 + 1], // row=1-y=2, col=x+1=1
-      }
-    },
-    // DR: [1, -1, 0]
-    { 
-      coord: [1, -1, 0], 
-      faceColors: {
-        D: cubeState.D[1 - 0][1 + 1], // row=1-z=1, col=x+1=2
-        R: cubeState.R[1 - (-1)][1 - 0], // row=1-y=2, col=1-z=1
-      }
-    },
-    // DB: [0, -1, -1]
-    { 
-      coord: [0, -1, -1], 
-      faceColors: {
-        D: cubeState.D[1 - (-1)][0 + 1], // row=1-z=2, col=x+1=1
-        B: cubeState.B[1 - (-1)][1 - 0], // row=1-y=2, col=1-x=1
-      }
-    },
-    // DL: [-1, -1, 0]
-    { 
-      coord: [-1, -1, 0], 
-      faceColors: {
-        D: cubeState.D[1 - 0][-1 + 1], // row=1-z=1, col=x+1=0
-        L: cubeState.L[1 - (-1)][0 + 1], // row=1-y=2, col=z+1=1
-      }
-    },
-    // FR: [1, 0, 1]
-    { 
-      coord: [1, 0, 1], 
-      faceColors: {
-        F: cubeState.F[1 - 0][1 + 1], // row=1-y=1, col=x+1=2
-        R: cubeState.R[1 - 0][1 - 1], // row=1-y=1, col=1-z=0
-      }
-    },
-    // FL: [-1, 0, 1]
-    { 
-      coord: [-1, 0, 1], 
-      faceColors: {
-        F: cubeState.F[1 - 0][-1 + 1], // row=1-y=1, col=x+1=0
-        L: cubeState.L[1 - 0][1 + 1], // row=1-y=1, col=z+1=2
-      }
-    },
-    // BR: [1, 0, -1]
-    { 
-      coord: [1, 0, -1], 
-      faceColors: {
-        B: cubeState.B[1 - 0][1 - 1], // row=1-y=1, col=1-x=0
-        R: cubeState.R[1 - 0][1 - (-1)], // row=1-y=1, col=1-z=2
-      }
-    },
-    // BL: [-1, 0, -1]
-    { 
-      coord: [-1, 0, -1], 
-      faceColors: {
-        B: cubeState.B[1 - 0][1 - (-1)], // row=1-y=1, col=1-x=2
-        L: cubeState.L[1 - 0][-1 + 1], // row=1-y=1, col=z+1=0
-      }
-    },
-  ]
-
-  // 为每个位置找到匹配的边块
-  for (const pos of edgePositions) {
-    const targetColors = Object.values(pos.faceColors).filter(c => c !== undefined) as FaceColor[]
-    const matchingEdge = findMatchingEdge(targetColors, solved.edges, result.edges)
-    if (!matchingEdge) {
-      throw new Error(`Invalid edge cubie at [${pos.coord.join(', ')}]: ${formatFaceColors(pos.faceColors)}`)
+/** 由已校验的 54 个颜色序号构建状态：每个槽位一次查表识别块，重复的块视为非法 */
+function buildCubieBasedState(facelets: Int8Array): CubieBasedCubeState {
+  const corners = {} as Record<string, CornerCubie>
+  let usedCorners = 0
+  for (const slot of CORNER_SLOTS) {
+    const [a, b, c] = slot.facelets
+    const entry = CORNER_LOOKUP[cornerColorKey(facelets[a], facelets[b], facelets[c])]
+    const piece = entry >> 2
+    if (entry < 0 || usedCorners & (1 << piece)) {
+      throw new Error(`Invalid corner cubie at [${slot.coordinate.join(', ')}]: ${formatSlotColors(slot, facelets)}`)
     }
-
-    result.edges[matchingEdge.id] = {
-      ...matchingEdge,
-      coordinate: pos.coord,
-      colors: adjustEdgeColors(pos.faceColors, pos.coord),
+    usedCorners |= 1 << piece
+    const id = CORNER_PIECE_IDS[piece]
+    corners[id] = { id, coordinate: [...slot.coordinate], colors: slotColors(slot, facelets) }
+  }
+
+  const edges = {} as Record<string, EdgeCubie>
+  let usedEdges = 0
+  for (const slot of EDGE_SLOTS) {
+    const [a, b] = slot.facelets
+    const entry = EDGE_LOOKUP[edgeColorKey(facelets[a], facelets[b])]
+    const piece = entry >> 1
+    if (entry < 0 || usedEdges & (1 << piece)) {
+      throw new Error(`Invalid edge cubie at [${slot.coordinate.join(', ')}]: ${formatSlotColors(slot, facelets)}`)
     }
+    usedEdges |= 1 << piece
+    const id = EDGE_PIECE_IDS[piece]
+    edges[id] = { id, coordinate: [...slot.coordinate], colors: slotColors(slot, facelets) }
   }
 
-  if (Object.keys(result.corners).length !== 8) {
-    throw new Error(`Invalid cube: expected 8 corner cubies, got ${Object.keys(result.corners).length}`)
-  }
-  if (Object.keys(result.edges).length !== 12) {
-    throw new Error(`Invalid cube: expected 12 edge cubies, got ${Object.keys(result.edges).length}`)
+  // 中心块已在校验中确认为标准颜色
+  const faces = {} as Record<string, FaceCubie>
+  for (const face of FACE_TEMPLATES) {
+    faces[face.id] = { id: face.id, coordinate: [...face.coordinate], color: face.color }
   }
 
-  return result
+  return { corners, edges, faces } as CubieBasedCubeState
 }
 
 /**
- * 找到匹配给定颜色的角块
- */
-function findMatchingCorner(
-  targetColors: FaceColor[],
-  solvedCorners: Record<CornerCubieId, { id: CornerCubieId, colors: CubieColors }>,
-  usedCorners: Record<string, any>
-): { id: CornerCubieId, colors: CubieColors } | null {
-  for (const [id, corner] of Object.entries(solvedCorners)) {
-    if (usedCorners[id]) continue // 已经被使用
-    
-    // 获取角块的三个可见颜色
-    const cornerColors = [
-      corner.colors.upper !== 'black' ? corner.colors.upper : null,
-      corner.colors.front !== 'black' ? corner.colors.front : null,
-      corner.colors.right !== 'black' ? corner.colors.right : null,
-      corner.colors.back !== 'black' ? corner.colors.back : null,
-      corner.colors.left !== 'black' ? corner.colors.left : null,
-      corner.colors.down !== 'black' ? corner.colors.down : null,
-    ].filter(c => c !== null) as FaceColor[]
-    
-    // 检查是否包含所有目标颜色
-    if (sameColorSet(targetColors, cornerColors)) {
-      return { id: id as CornerCubieId, colors: corner.colors }
-    }
-  }
-  return null
-}
-
-/**
- * 找到匹配给定颜色的边块
+ * 从 CubeState 创建 CubieBasedCubeState
+ *
+ * 1. 校验 3×3 网格、中心颜色与 9 色计数，同时读出 54 个颜色序号
+ * 2. 每个角块 / 棱块槽位：按固定贴纸下标取颜色，查表得到块（颜色集合匹配，不限朝向）
+ * 3. 块放在槽位坐标上，表面颜色取自槽位贴纸；同一块出现两次或颜色集合不存在时报错
  */
-function findMatchingEdge(
-  targetColors: FaceColor[],
-  solvedEdges: Record<EdgeCubieId, { id: EdgeCubieId, colors: CubieColors }>,
-  usedEdges: Record<string, any>
-): { id: EdgeCubieId, colors: CubieColors } | null {
-  for (const [id, edge] of Object.entries(solvedEdges)) {
-    if (usedEdges[id]) continue // 已经被使用
-    
-    // 获取边块的两个可见颜色
-    const edgeColors = [
-      edge.colors.upper !== 'black' ? edge.colors.upper : null,
-      edge.colors.front !== 'black' ? edge.colors.front : null,
-      edge.colors.right !== 'black' ? edge.colors.right : null,
-      edge.colors.back !== 'black' ? edge.colors.back : null,
-      edge.colors.left !== 'black' ? edge.colors.left : null,
-      edge.colors.down !== 'black' ? edge.colors.down : null,
-    ].filter(c => c !== null) as FaceColor[]
-    
-    // 检查是否包含所有目标颜色
-    if (sameColorSet(targetColors, edgeColors)) {
-      return { id: id as EdgeCubieId, colors: edge.colors }
-    }
-  }
-  return null
+export function faceColorsToCubieBasedState(cubeState: CubeState): CubieBasedCubeState {
+  const facelets = new Int8Array(54)
+  readFacelets(cubeState, facelets)
+  return buildCubieBasedState(facelets)
 }
 
-/**
- * 调整角块颜色以匹配当前位置
- * 根据坐标确定哪些面可见，然后设置对应的颜色
- */
-function adjustCornerColors(
-  targetFaceColors: { U?: FaceColor, D?: FaceColor, F?: FaceColor, B?: FaceColor, R?: FaceColor, L?: FaceColor },
-  coord: [number, number, number]
-): CubieColors {
-  const [x, y, z] = coord
-  const result: CubieColors = createBlackCubieColors()
-  
-  // 根据坐标确定哪些面可见，然后设置对应的颜色
-  // y=1 表示在魔方的 U 面，此时 cubie 的 upper 面可见
-  if (y === 1 && targetFaceColors.U) {
-    result.upper = targetFaceColors.U
-  }
-  // y=-1 表示在魔方的 D 面，此时 cubie 的 down 面可见
-  if (y === -1 && targetFaceColors.D) {
-    result.down = targetFaceColors.D
-  }
-  // z=1 表示在魔方的 F 面，此时 cubie 的 front 面可见
-  if (z === 1 && targetFaceColors.F) {
-    result.front = targetFaceColors.F
-  }
-  // z=-1 表示在魔方的 B 面，此时 cubie 的 back 面可见
-  if (z === -1 && targetFaceColors.B) {
-    result.back = targetFaceColors.B
-  }
-  // x=1 表示在魔方的 R 面，此时 cubie 的 right 面可见
-  if (x === 1 && targetFaceColors.R) {
-    result.right = targetFaceColors.R
-  }
-  // x=-1 表示在魔方的 L 面，此时 cubie 的 left 面可见
-  if (x === -1 && targetFaceColors.L) {
-    result.left = targetFaceColors.L
-  }
-  
-  return result
+export interface FaceColorsBatchResult {
+  /** 与输入同序；转换失败的位置为 null */
+  states: (CubieBasedCubeState | null)[]
+  /** 与输入同序；成功的位置为 null，否则为 faceColorsToCubieBasedState 会抛出的错误信息 */
+  errors: (string | null)[]
+  failed: number
 }
 
 /**
- * 调整边块颜色以匹配当前位置
- * 根据坐标确定哪些面可见，然后设置对应的颜色
+ * 批量转换：复用同一块贴纸缓冲区，单条失败不中断整批
  */
-function adjustEdgeColors(
-  targetFaceColors: { U?: FaceColor, D?: FaceColor, F?: FaceColor, B?: FaceColor, R?: FaceColor, L?: FaceColor },
-  coord: [number, number, number]
-): CubieColors {
-  const [x, y, z] = coord
-  const result: CubieColors = createBlackCubieColors()
-  
-  // 根据坐标确定哪些面可见，然后设置对应的颜色
-  if (y === 1 && targetFaceColors.U) {
-    result.upper = targetFaceColors.U
-  }
-  if (y === -1 && targetFaceColors.D) {
-    result.down = targetFaceColors.D
-  }
-  if (z === 1 && targetFaceColors.F) {
-    result.front = targetFaceColors.F
-  }
-  if (z === -1 && targetFaceColors.B) {
-    result.back = targetFaceColors.B
-  }
-  if (x === 1 && targetFaceColors.R) {
-    result.right = targetFaceColors.R
-  }
-  if (x === -1 && targetFaceColors.L) {
-    result.left = targetFaceColors.L
+export function faceColorsToCubieBasedStates(cubeStates: readonly CubeState[]): FaceColorsBatchResult {
+  const facelets = new Int8Array(54)
+  const states: (CubieBasedCubeState | null)[] = new Array(cubeStates.length)
+  const errors: (string | null)[] = new Array(cubeStates.length)
+  let failed = 0
+  for (let i = 0; i < cubeStates.length; i++) {
+    try {
+      readFacelets(cubeStates[i], facelets)
+      states[i] = buildCubieBasedState(facelets)
+      errors[i] = null
+    } catch (error) {
+      states[i] = null
+      errors[i] = error instanceof Error ? error.message : String(error)
+      failed++
+    }
   }
-  
-  return result
+  return { states, errors, failed }
 }
@@ -0,0 +1,75 @@
+/**
+ * 贴纸 ↔ 块的固定查表（Kociemba 贴纸下标：URFDLB，每面行优先，与 CubeState 的 3×3 网格一致）
+ *
+ * - 每个角块 / 棱块槽位的贴纸下标三元组 / 二元组（首个在 U/D 面，E 层棱首个在 F/B 面，角块顺时针）
+ * - 颜色序列 → (块, 朝向) 查找表：按槽位贴纸顺序读出的颜色编码为一个小整数，一次数组访问即得
+ *
+ * 颜色用面序号表示（FACELET_FACES 下标，即该颜色中心所在的面）。
+ * 放置约定：块 p 以朝向 o 位于槽位 s 时，贴纸 facelets[s][(k + o) % n] 的颜色为 colors[p][k]。
+ */
+
+import type { Face } from './cubeTypes'
+
+export const FACELET_FACES: readonly Face[] = ['U', 'R', 'F', 'D', 'L', 'B']
+
+/** 角块槽位：URF UFL ULB UBR DFR DLF DBL DRB */
+export const CORNER_FACELETS: readonly (readonly [number, number, number])[] = [
+  [8, 9, 20], [6, 18, 38], [0, 36, 47], [2, 45, 11],
+  [29, 26, 15], [27, 44, 24], [33, 53, 42], [35, 17, 51],
+]
+/** 角块颜色（面序号，与 CORNER_FACELETS 同序） */
+export const CORNER_COLORS: readonly (readonly [number, number, number])[] = [
+  [0, 1, 2], [0, 2, 4], [0, 4, 5], [0, 5, 1],
+  [3, 2, 1], [3, 4, 2], [3, 5, 4], [3, 1, 5],
+]
+/** 棱块槽位：UR UF UL UB DR DF DL DB FR FL BL BR */
+export const EDGE_FACELETS: readonly (readonly [number, number])[] = [
+  [5, 10], [7, 19], [3, 37], [1, 46], [32, 16], [28, 25],
+  [30, 43], [34, 52], [23, 12], [21, 41], [50, 39], [48, 14],
+]
+export const EDGE_COLORS: readonly (readonly [number, number])[] = [
+  [0, 1], [0, 2], [0, 4], [0, 5], [3, 1], [3, 2],
+  [3, 4], [3, 5], [2, 1], [2, 4], [5, 4], [5, 1],
+]
+
+/** 角块查找表中「颜色集合对、但手性相反」的朝向值（物理上不存在，集合匹配时仍视为该块） */
+export const CORNER_MIRRORED = 3
+
+export function cornerColorKey(a: number, b: number, c: number): number {
+  return a * 36 + b * 6 + c
+}
+
+export function edgeColorKey(a: number, b: number): number {
+  return a * 6 + b
+}
+
+/**
+ * 角块查找表：cornerColorKey(槽位三个贴纸颜色) → 块 * 4 + 朝向（0..2，或 CORNER_MIRRORED）；
+ * 颜色集合不是任何角块时为 -1
+ */
+export const CORNER_LOOKUP: Int8Array = (() => {
+  const table = new Int8Array(216).fill(-1)
+  CORNER_COLORS.forEach((colors, piece) => {
+    for (let o = 0; o < 3; o++) {
+      const seen = [0, 0, 0]
+      const mirrored = [0, 0, 0]
+      for (let k = 0; k < 3; k++) {
+        seen[(k + o) % 3] = colors[k]
+        mirrored[(6 - k - o) % 3] = colors[k]
+      }
+      table[cornerColorKey(seen[0], seen[1], seen[2])] = piece * 4 + o
+      table[cornerColorKey(mirrored[0], mirrored[1], mirrored[2])] = piece * 4 + CORNER_MIRRORED
+    }
+  })
+  return table
+})()
+
+/** 棱块查找表：edgeColorKey(槽位两个贴纸颜色) → 块 * 2 + 朝向；不是任何棱块时为 -1 */
+export const EDGE_LOOKUP: Int8Array = (() => {
+  const table = new Int8Array(36).fill(-1)
+  EDGE_COLORS.forEach(([a, b], piece) => {
+    table[edgeColorKey(a, b)] = piece * 2
+    table[edgeColorKey(b, a)] = piece * 2 + 1
+  })
+  return table
+})()
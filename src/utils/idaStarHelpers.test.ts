@@ -0,0 +1,42 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMove, createSolvedCubieBasedCube } from './cubieBasedCubeLogic'
+import {
+  heuristicFromPieceCounters,
+  manhattanSums,
+  pieceHeuristicCounters,
+  pieceHeuristicCountersAfterMove,
+  pieceSlotIndex,
+} from './idaStarHelpers'
+
+const SCRAMBLE: Move[] = [
+  'R', "U'", 'F2', 'D', 'L2', 'B', "R'", 'U2', 'F', "D'", 'L', 'B2',
+]
+
+describe('incremental IDA* heuristic counters', () => {
+  it('match a full rescan after every move of a scramble', () => {
+    const solved = createSolvedCubieBasedCube()
+    let state = createSolvedCubieBasedCube()
+    let counters = pieceHeuristicCounters(state, solved)
+    expect(counters).toMatchObject({ cornerWrong: 0, edgeWrong: 0, sumCorner: 0, sumEdge: 0 })
+
+    for (const move of SCRAMBLE) {
+      const next = applyMove(state, move)
+      counters = pieceHeuristicCountersAfterMove(counters, state, next, solved, move)
+      state = next
+
+      // 槽位索引也与全量重建一致（toEqual 同时比较 cornerAt / edgeAt）
+      expect(counters).toEqual(pieceHeuristicCounters(state, solved))
+      expect(counters.cornerAt).toEqual(pieceSlotIndex(state).cornerAt)
+      const { sumCorner, sumEdge } = manhattanSums(state, solved)
+      expect(counters.sumCorner).toBe(sumCorner)
+      expect(counters.sumEdge).toBe(sumEdge)
+    }
+  })
+
+  it('gives h = 1 for a single quarter turn', () => {
+    const solved = createSolvedCubieBasedCube()
+    const state = applyMove(solved, 'R')
+    expect(heuristicFromPieceCounters(pieceHeuristicCounters(state, solved))).toBe(1)
+  })
+})
@@ -2,7 +2,17 @@
  * IDA* 辅助：紧凑状态键、快速判等、Manhattan 下界（与 cubeSolver 配合）
  */
 
-import type { CubieBasedCubeState, CubeState, FaceColor } from './cubeTypes'
+import type {
+  CornerCubie,
+  CornerCubieId,
+  CubieBasedCubeState,
+  CubeState,
+  EdgeCubie,
+  EdgeCubieId,
+  FaceColor,
+  Move,
+} from './cubeTypes'
+import { createSolvedCubieBasedCube } from './cubieBasedCubeLogic'
 
 /** 与 Kociemba cubestring 一致的颜色单字符，便于 54 位状态键 */
 export function faceColorToKeyChar(c: FaceColor): string {
@@ -109,3 +119,167 @@ export function manhattanSums(
 
   return { sumCorner, sumEdge }
 }
+
+/**
+ * 槽位索引：槽位按已还原状态中的块编号（角 UFR UFL UBL UBR DFR DFL DBL DBR，棱 UF UR UB UL DF DR DB DL FR FL BR BL），
+ * cornerAt[s] / edgeAt[s] 为当前占据槽位 s 的块 id。增量更新凭它直接取出转动层上的 8 块。
+ */
+export type PieceSlotIndex = {
+  cornerAt: CornerCubieId[]
+  edgeAt: EdgeCubieId[]
+}
+
+/**
+ * 完整空间 IDA* 启发式所需的逐块计数：错块数与 Manhattan 和，并携带槽位索引。
+ * 一次面转只移动该层 4 角 4 棱，因此可沿搜索栈增量维护，每个子结点只读这 8 块。
+ */
+export type PieceHeuristicCounters = PieceSlotIndex & {
+  cornerWrong: number
+  edgeWrong: number
+  sumCorner: number
+  sumEdge: number
+}
+
+/** 各面转动所在层：[坐标轴, 取值]（R: x=1、L: x=-1、U: y=1 …） */
+export const MOVE_LAYER_BY_FACE: Record<string, readonly [number, number]> = {
+  R: [0, 1],
+  L: [0, -1],
+  U: [1, 1],
+  D: [1, -1],
+  F: [2, 1],
+  B: [2, -1],
+}
+
+const CORNER_SLOT_IDS: readonly CornerCubieId[] = ['UFR', 'UFL', 'UBL', 'UBR', 'DFR', 'DFL', 'DBL', 'DBR']
+const EDGE_SLOT_IDS: readonly EdgeCubieId[] = ['UF', 'UR', 'UB', 'UL', 'DF', 'DR', 'DB', 'DL', 'FR', 'FL', 'BR', 'BL']
+
+function coordinateKey(p: readonly number[]): number {
+  return (p[0] + 1) * 9 + (p[1] + 1) * 3 + (p[2] + 1)
+}
+
+/** coordinateKey → 槽位号（角块、棱块坐标互不重叠，共用一张表）；非角 / 棱坐标为 -1 */
+const SLOT_BY_COORDINATE = new Int8Array(27).fill(-1)
+/** 各面转动层包含的槽位：4 个角块槽位与 4 个棱块槽位 */
+const LAYER_SLOTS: Record<string, { corners: number[]; edges: number[] }> = {}
+{
+  const solved = createSolvedCubieBasedCube()
+  for (const face of Object.keys(MOVE_LAYER_BY_FACE)) {
+    LAYER_SLOTS[face] = { corners: [], edges: [] }
+  }
+  const addSlot = (coordinate: readonly number[], slot: number, kind: 'corners' | 'edges') => {
+    SLOT_BY_COORDINATE[coordinateKey(coordinate)] = slot
+    for (const [face, [axis, value]] of Object.entries(MOVE_LAYER_BY_FACE)) {
+      if (coordinate[axis] === value) LAYER_SLOTS[face][kind].push(slot)
+    }
+  }
+  CORNER_SLOT_IDS.forEach((id, slot) => addSlot(solved.corners[id].coordinate, slot, 'corners'))
+  EDGE_SLOT_IDS.forEach((id, slot) => addSlot(solved.edges[id].coordinate, slot, 'edges'))
+}
+
+/** 坐标所在的角块 / 棱块槽位号（槽位编号见 PieceSlotIndex） */
+export function slotOfCoordinate(coordinate: readonly number[]): number {
+  return SLOT_BY_COORDINATE[coordinateKey(coordinate)]
+}
+
+/** 全量扫描建立槽位索引 */
+export function pieceSlotIndex(state: CubieBasedCubeState): PieceSlotIndex {
+  const cornerAt = new Array<CornerCubieId>(CORNER_SLOT_IDS.length)
+  const edgeAt = new Array<EdgeCubieId>(EDGE_SLOT_IDS.length)
+  for (const id of CORNER_SLOT_IDS) cornerAt[slotOfCoordinate(state.corners[id].coordinate)] = id
+  for (const id of EDGE_SLOT_IDS) edgeAt[slotOfCoordinate(state.edges[id].coordinate)] = id
+  return { cornerAt, edgeAt }
+}
+
+/** 该步转动层上的槽位（4 角 4 棱，槽位编号见 PieceSlotIndex） */
+export function layerSlotsOfMove(move: Move): { corners: readonly number[]; edges: readonly number[] } {
+  return LAYER_SLOTS[move[0]]
+}
+
+function pieceWrong(
+  piece: CornerCubie | EdgeCubie,
+  home: CornerCubie | EdgeCubie
+): boolean {
+  const p = piece.coordinate
+  const h = home.coordinate
+  if (p[0] !== h[0] || p[1] !== h[1] || p[2] !== h[2]) return true
+  const c = piece.colors
+  const s = home.colors
+  return (
+    c.upper !== s.upper || c.down !== s.down || c.front !== s.front ||
+    c.back !== s.back || c.left !== s.left || c.right !== s.right
+  )
+}
+
+/** 全量扫描 8 角 12 棱，得到根结点的计数 */
+export function pieceHeuristicCounters(
+  state: CubieBasedCubeState,
+  solved: CubieBasedCubeState
+): PieceHeuristicCounters {
+  const out: PieceHeuristicCounters = {
+    cornerWrong: 0,
+    edgeWrong: 0,
+    sumCorner: 0,
+    sumEdge: 0,
+    ...pieceSlotIndex(state),
+  }
+  for (const id of CORNER_SLOT_IDS) {
+    const c = state.corners[id]
+    const home = solved.corners[id]
+    if (pieceWrong(c, home)) out.cornerWrong++
+    out.sumCorner += manhattan3(c.coordinate, home.coordinate)
+  }
+  for (const id of EDGE_SLOT_IDS) {
+    const e = state.edges[id]
+    const home = solved.edges[id]
+    if (pieceWrong(e, home)) out.edgeWrong++
+    out.sumEdge += manhattan3(e.coordinate, home.coordinate)
+  }
+  return out
+}
+
+/**
+ * 增量计数：经父结点的槽位索引取出转动层上的 4 角 4 棱，
+ * 对这 8 块减去转动前的贡献、加上转动后的贡献；其余块不动，结果与全量扫描一致。
+ */
+export function pieceHeuristicCountersAfterMove(
+  parent: PieceHeuristicCounters,
+  before: CubieBasedCubeState,
+  after: CubieBasedCubeState,
+  solved: CubieBasedCubeState,
+  move: Move
+): PieceHeuristicCounters {
+  const layer = LAYER_SLOTS[move[0]]
+  const out: PieceHeuristicCounters = {
+    ...parent,
+    cornerAt: parent.cornerAt.slice(),
+    edgeAt: parent.edgeAt.slice(),
+  }
+  for (const slot of layer.corners) {
+    const id = parent.cornerAt[slot]
+    const home = solved.corners[id]
+    const from = before.corners[id]
+    const to = after.corners[id]
+    out.cornerWrong += Number(pieceWrong(to, home)) - Number(pieceWrong(from, home))
+    out.sumCorner += manhattan3(to.coordinate, home.coordinate) - manhattan3(from.coordinate, home.coordinate)
+    out.cornerAt[slotOfCoordinate(to.coordinate)] = id
+  }
+  for (const slot of layer.edges) {
+    const id = parent.edgeAt[slot]
+    const home = solved.edges[id]
+    const from = before.edges[id]
+    const to = after.edges[id]
+    out.edgeWrong += Number(pieceWrong(to, home)) - Number(pieceWrong(from, home))
+    out.sumEdge += manhattan3(to.coordinate, home.coordinate) - manhattan3(from.coordinate, home.coordinate)
+    out.edgeAt[slotOfCoordinate(to.coordinate)] = id
+  }
+  return out
+}
+
+/**
+ * 取「错块数/4」与 Manhattan 下界的 max（半转一步最多让角块 Manhattan 合计减 16、棱块减 8）。
+ */
+export function heuristicFromPieceCounters(c: PieceHeuristicCounters): number {
+  const hWrong = Math.max(Math.ceil(c.cornerWrong / 4), Math.ceil(c.edgeWrong / 4))
+  const hMan = Math.max(Math.ceil(c.sumCorner / 16), Math.ceil(c.sumEdge / 8))
+  return Math.max(hWrong, hMan)
+}
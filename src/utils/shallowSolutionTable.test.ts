@@ -0,0 +1,114 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring, SOLVED_CUBESTRING } from './cubestringCodec'
+import { lookupShallowSolution, parseShallowSolutionTable } from './shallowSolutionTable'
+
+// python tools/shallow_table.py build --depth 2 生成的表（base64），校验两端格式一致
+const DEPTH2_TABLE_BASE64 = [
+  'Q1NIVAEAAjAMAAAAIAAAAAABAgMEBQYHCAkKCwwNDg8QERITFBUWFxgZGhscHR4fICEiIyQlJicoKSorLC0uLzAxMjM0NQAB',
+  'AgMEBQABAgMEBQYHCAkKCwwNDg8QEQYHCAMEBQABAgsKCQ4NDBEQDy8uLTIxMDU0MyEiIx4fIBscHSYlJCkoJywrKhQTEhcW',
+  'FRoZGAABBQMEAgEAAgQDBQcGCAoJCxAPEQ0MDiEiIx4fIBscHQ8QEQwNDgkKCxgZGhUWFxITFAYHCAMEBQABAiorLCcoKSQl',
+  'JjM0NTAxMi0uLwMBAgAEBQEAAgQDBQoJCwcGCA0MDhAPERscHR4fICEiIxEQDw4NDAsKCTU0MzIxMC8uLQABAgMEBQYHCCwr',
+  'KikoJyYlJBoZGBcWFRQTEgMBBQAEAgABAgMEBQkKCwYHCA8QEQwNDgIBAAUEAwgHBiYlJCkoJywrKhQTEhcWFRoZGB0cGyAf',
+  'HiMiIQsKCQ4NDBEQDy8uLTIxMDU0MwAEAgMBBQQDBQEAAgcGCAoJCw0MDhAPEQgHBgUEAwIBACQlJicoKSorLC0uLzAxMjM0',
+  'NSMiISAfHh0cGwkKCwwNDg8QERITFBUWFxgZGgAEBQMBAgMEBQABAgYHCAkKCw8QEQwNDiMiISAfHh0cGywrKikoJyYlJBoZ',
+  'GBcWFRQTEggHBgUEAwIBABEQDw4NDAsKCTU0MzIxMC8uLQMEAgABBQMEBQABAgkKCwYHCAwNDg8QER0cGyAfHiMiISorLCco',
+  'KSQlJjM0NTAxMi0uLwIBAAUEAwgHBg8QEQwNDgkKCxgZGhUWFxITFAMEBQABAgQDBQEAAgoJCwcGCBAPEQ0MDhgZGhUWFxIT',
+  'FAkMDwoNEAsOEQYHCAMEBQABAi8uLTIxMDU0MywpJisoJSonJB0cGyAfHiMiIQIBAAUEAwEAAgQDBQ0MDhAPEQcGCAoJCxIT',
+  'FBUWFxgZGg8MCRANChEOCxscHR4fICEiIzU0MzIxMC8uLSYpLCUoKyQnKggHBgUEAwIBAAUBAAIEAwABAgMEBQwNDg8QEQkK',
+  'CwYHCDU0MzIxMC8uLQsOEQoNEAkMDwABAgMEBQYHCBITFBUWFxgZGionJCsoJSwpJiMiISAfHh0cGwIBAwUEAAABAgMEBQ8Q',
+  'EQwNDgYHCAkKCy8uLTIxMDU0MxEOCxANCg8MCSEiIx4fIBscHRgZGhUWFxITFCQnKiUoKyYpLAIBAAUEAwgHBgUBAwIEAAEA',
+  'AgQDBRAPEQ0MDgoJCwcGCBoZGBcWFRQTEiYpLCUoKyQnKggHBgUEAwIBAC0uLzAxMjM0NQ8MCRANChEOCxscHR4fICEiIwIE',
+  'AAUBAwMEBQABAgwNDg8QEQYHCAkKCxQTEhcWFRoZGCwpJisoJSonJB0cGyAfHiMiITM0NTAxMi0uLwkMDwoNEAsOEQYHCAME',
+  'BQABAgUEAAIBAwQDBQEAAg0MDhAPEQoJCwcGCDM0NTAxMi0uLyQnKiUoKyYpLAIBAAUEAwgHBhQTEhcWFRoZGBEOCxANCg8M',
+  'CSEiIx4fIBscHQIEAwUBAAQDBQEAAhAPEQ0MDgcGCAoJCy0uLzAxMjM0NSonJCsoJSwpJiMiISAfHh0cGxoZGBcWFRQTEgsO',
+  'EQoNEAkMDwABAgMEBQYHCAUEAwIBAAMEBQABAg8QEQwNDgkKCwYHCBEOCxANCg8MCQgFAgcEAQYDABoXFBkWExgVEiwpJiso',
+  'JSonJCMgHSIfHCEeGy0wMy4xNC8yNQEAAgQDBQcGCAoJCwEAAgQDBQ0MDhAPEQ8MCRANChEOCwIFCAEEBwADBjMwLTQxLjUy',
+  'LyonJCsoJSwpJh0gIxwfIhseIRQXGhMWGRIVGAEABQQDAgYHCAkKCwABAgMEBQ8QEQwNDionJCsoJSwpJgYDAAcEAQgFAhgV',
+  'EhkWExoXFA8MCRANChEOCyEeGyIfHCMgHS8yNS4xNC0wMwEDAgQABQYHCAkKCwMEBQABAgwNDg8QESwpJisoJSonJAADBgEE',
+  'BwIFCDUyLzQxLjMwLREOCxANCg8MCRseIRwfIh0gIxIVGBMWGRQXGgEDBQQAAgcGCAoJCwQDBQEAAhAPEQ0MDgsOEQoNEAkM',
+  'Dx0gIxwfIhseIRQXGhMWGRIVGCYpLCUoKyQnKgIFCAEEBwADBjMwLTQxLjUyLwQAAgEDBQkKCwYHCAABAgMEBQwNDg8QEQkM',
+  'DwoNEAsOESMgHSIfHCEeGy0wMy4xNC8yNSQnKiUoKyYpLAgFAgcEAQYDABoXFBkWExgVEgQABQEDAgoJCwcGCAEAAgQDBRAP',
+  'EQ0MDiQnKiUoKyYpLBseIRwfIh0gIxIVGBMWGRQXGgkMDwoNEAsOEQADBgEEBwIFCDUyLzQxLjMwLQQDAgEABQoJCwcGCAQD',
+  'BQEAAg0MDhAPESYpLCUoKyQnKiEeGyIfHCMgHS8yNS4xNC0wMwsOEQoNEAkMDwYDAAcEAQgFAhgVEhkWExoXFAQDBQEAAgkK',
+  'CwYHCAMEBQABAg8QEQwNDhgVEhkWExoXFAgHBgUEAwIBAA8MCRANChEOCzMwLTQxLjUyLxscHR4fICEiIyYpLCUoKyQnKgEC',
+  'AAQFAwYHCAkKCwwNDg8QEQABAgMEBRoXFBkWExgVEgYHCAMEBQABAiwpJisoJSonJDUyLzQxLjMwLR0cGyAfHiMiIQkMDwoN',
+  'EAsOEQEFAAQCAwcGCAoJCw0MDhAPEQQDBQEAAjUyLzQxLjMwLQIBAAUEAwgHBhEOCxANCg8MCRoXFBkWExgVEiEiIx4fIBsc',
+  'HSQnKiUoKyYpLAECAwQFAAcGCAoJCxAPEQ0MDgEAAgQDBTMwLTQxLjUyLwABAgMEBQYHCConJCsoJSwpJhgVEhkWExoXFCMi',
+  'ISAfHh0cGwsOEQoNEAkMDwEFAwQCAAYHCAkKCw8QEQwNDgMEBQABAhIVGBMWGRQXGh0cGyAfHiMiIQkMDwoNEAsOES0wMy4x',
+  'NC8yNQYHCAMEBQABAiwpJisoJSonJAQCAAEFAwoJCwcGCA0MDhAPEQEAAgQDBRQXGhMWGRIVGBscHR4fICEiIyYpLCUoKyQn',
+  'Ki8yNS4xNC0wMwgHBgUEAwIBAA8MCRANChEOCwQFAAECAwkKCwYHCAwNDg8QEQMEBQABAi8yNS4xNC0wMyMiISAfHh0cGwsO',
+  'EQoNEAkMDxQXGhMWGRIVGAABAgMEBQYHCConJCsoJSwpJgQCAwEFAAkKCwYHCA8QEQwNDgABAgMEBS0wMy4xNC8yNSEiIx4f',
+  'IBscHSQnKiUoKyYpLBIVGBMWGRQXGgIBAAUEAwgHBhEOCxANCg8MCQQFAwECAAoJCwcGCBAPEQ0MDgQDBQEAAhEQDw4NDAsK',
+  'CRQXGhMWGRIVGAIFCAEEBwADBiQlJicoKSorLDMwLTQxLjUyLx0gIxwfIhseIQIAAQUDBAwNDg8QEQABAgMEBQYHCAkKCwsK',
+  'CQ4NDBEQDxoXFBkWExgVEiMgHSIfHCEeGyorLCcoKSQlJi0wMy4xNC8yNQgFAgcEAQYDAAUAAQIDBA0MDhAPEQEAAgQDBQoJ',
+  'CwcGCCorLCcoKSQlJhIVGBMWGRQXGgADBgEEBwIFCAsKCQ4NDBEQDzUyLzQxLjMwLRseIRwfIh0gIwIDAQUABA0MDhAPEQQD',
+  'BQEAAgcGCAoJCyQlJicoKSorLBgVEhkWExoXFCEeGyIfHCMgHREQDw4NDAsKCS8yNS4xNC0wMwYDAAcEAQgFAgUDAQIABAwN',
+  'Dg8QEQMEBQABAgkKCwYHCA8QEQwNDgkKCy0wMy4xNC8yNQgFAgcEAQYDACYlJCkoJywrKhoXFBkWExgVEiMgHSIfHCEeGwIA',
+  'BAUDARAPEQ0MDgEAAgQDBQcGCAoJCwkKCwwNDg8QETMwLTQxLjUyLx0gIxwfIhseISwrKikoJyYlJBQXGhMWGRIVGAIFCAEE',
+  'BwADBgUABAIDAQ8QEQwNDgABAgMEBQkKCwYHCCwrKikoJyYlJC8yNS4xNC0wMwYDAAcEAQgFAgkKCwwNDg8QERgVEhkWExoX',
+  'FCEeGyIfHCMgHQIDBAUAAQ8QEQwNDgMEBQABAgYHCAkKCyYlJCkoJywrKjUyLzQxLjMwLRseIRwfIh0gIw8QEQwNDgkKCxIV',
+  'GBMWGRQXGgADBgEEBwIFCAUDBAIAARAPEQ0MDgQDBQEAAgoJCwcGCAADBgEEBwIFCBQTEhcWFRoZGAsKCQ4NDBEQDyMgHSIf',
+  'HCEeGy8uLTIxMDU0MyYlJCkoJywrKgACAQMFBA0MDhAPEQcGCAoJCwEAAgQDBQIFCAEEBwADBhITFBUWFxgZGiQlJicoKSor',
+  'LCEeGyIfHCMgHS0uLzAxMjM0NQkKCwwNDg8QEQAFAQMCBAwNDg8QEQYHCAkKCwMEBQABAiEeGyIfHCMgHRoZGBcWFRQTEhEQ',
+  'Dw4NDAsKCQIFCAEEBwADBjU0MzIxMC8uLSwrKikoJyYlJAMCAQAFBAwNDg8QEQkKCwYHCAABAgMEBSMgHSIfHCEeGxgZGhUW',
+  'FxITFCorLCcoKSQlJgADBgEEBwIFCDM0NTAxMi0uLw8QEQwNDgkKCwMFAQACBA0MDhAPEQoJCwcGCAQDBQEAAgYDAAcEAQgF',
+  'Ai0uLzAxMjM0NQkKCwwNDg8QER0gIxwfIhseIRITFBUWFxgZGiQlJicoKSorLAACBAMFAQ8QEQwNDgYHCAkKCwABAgMEBQgF',
+  'AgcEAQYDAC8uLTIxMDU0MyYlJCkoJywrKhseIRwfIh0gIxQTEhcWFRoZGAsKCQ4NDBEQDwAFBAMCARAPEQ0MDgcGCAoJCwQD',
+  'BQEAAhseIRwfIh0gIzM0NTAxMi0uLw8QEQwNDgkKCwgFAgcEAQYDABgZGhUWFxITFCorLCcoKSQlJgMCBAAFARAPEQ0MDgoJ',
+  'CwcGCAEAAgQDBR0gIxwfIhseITU0MzIxMC8uLSwrKikoJyYlJAYDAAcEAQgFAhoZGBcWFRQTEhEQDw4NDAsKCQMFBAACAQ8Q',
+  'EQwNDgkKCwYHCAMEBQABAgAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAA',
+  'AAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAN0gQAnDhNI0aVtXASHDkC2KFgIRAdsG',
+  'AAnDhJWqStswAGQYMq2qVgIFEQAAAAAAAAAAAAAAAAAAAAAAAP8AANsAAAnDhJIkSds2ACHDkG3btgERAIWqQkmSJNAwaFpV',
+  'rSRJkugwdAIBBCWLAgmCBJQgSNo0JdtIkm26dgIEDwAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8A',
+  'AAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAEmSJJIk',
+  'Sdu2bSRJkm3btgAAANuAbQxJhpIkSQA2AGGSMG3btgIOEQAAAAAAAAAAAAAAAAAAAAAAAP8AAMW6YkmSJFBRqBoEDSRJkuo0',
+  'dQICBAAAAAAAAAAAAAAAAAAAAAAAAP8AAG0BAO2SJEkgSNo0bZBIkiS7dgIHBEXbokmSJBAACJokTSRJkuu2dQIABAAAAAAA',
+  'AAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAN2KAgnDhJMgSNo0AUlI',
+  'ki26dgIEEQAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAAAAAAAAAAAAAAAAAAAAAAAAP8AAAWK',
+  'AkmSJJAgSNo0bSRJku26dgEEAAAAAAAAAAAAAAAAAAAAAAAAAP8AAA==',
+].join('')
+
+function loadDepth2Table() {
+  const binary = atob(DEPTH2_TABLE_BASE64)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i)
+  return parseShallowSolutionTable(bytes.buffer)
+}
+
+describe('shallow solution table', () => {
+  const table = loadDepth2Table()
+  const faces = ['R', 'L', 'U', 'D', 'F', 'B']
+  const suffixes = ['', "'", '2']
+  const moves = faces.flatMap((f) => suffixes.map((s) => (f + s) as Move))
+
+  it('reads the header written by the Python generator', () => {
+    expect(table.maxDepth).toBe(2)
+    expect(table.symmetries).toHaveLength(48)
+    expect(table.entryCount).toBe(12)
+  })
+
+  it('returns optimal solutions for every state within depth 2', () => {
+    expect(lookupShallowSolution(table, SOLVED_CUBESTRING)).toEqual([])
+    for (const a of moves) {
+      const one = applyMovesToCubestring(SOLVED_CUBESTRING, [a])
+      const oneSolution = lookupShallowSolution(table, one)
+      expect(oneSolution).toHaveLength(1)
+      expect(applyMovesToCubestring(one, oneSolution!)).toBe(SOLVED_CUBESTRING)
+
+      for (const b of moves) {
+        if (a[0] === b[0]) continue
+        const two = applyMovesToCubestring(SOLVED_CUBESTRING, [a, b])
+        const solution = lookupShallowSolution(table, two)
+        expect(solution).toHaveLength(2)
+        expect(applyMovesToCubestring(two, solution!)).toBe(SOLVED_CUBESTRING)
+      }
+    }
+  })
+
+  it('misses states deeper than the table and invalid input', () => {
+    const deep = applyMovesToCubestring(SOLVED_CUBESTRING, ['R', 'U', 'F'])
+    expect(lookupShallowSolution(table, deep)).toBeNull()
+    expect(lookupShallowSolution(table, 'UUU')).toBeNull()
+  })
+})
@@ -0,0 +1,187 @@
+/**
+ * 浅层状态最优解查表（读取 tools/shallow_table.py 离线生成的 'CSHT' 文件）。
+ *
+ * 表对 48 个整体对称约化：查询时取 cubestring 在所有对称下字典序最小的像作为代表元，
+ * 打包后在开放寻址哈希表中探测，再用该对称的 move_back 把代表元的解映射回原状态。
+ * 文件格式见 tools/shallow_table.py 顶部说明。
+ */
+
+import type { Move } from './cubeTypes'
+
+const MAGIC = 'CSHT'
+const VERSION = 1
+const HEADER_SIZE = 16
+const KEY_SIZE = 18
+const EMPTY_SLOT = 0xff
+const FACE_CHARS = 'URFDLB'
+const CENTER_INDEXES = new Set([4, 13, 22, 31, 40, 49])
+
+/** 与 tools/cube_facelets.py 的 MOVES、cubeSolver 的 allMoves 顺序一致 */
+const TABLE_MOVES: readonly Move[] = [
+  'R', "R'", 'R2',
+  'L', "L'", 'L2',
+  'U', "U'", 'U2',
+  'D', "D'", 'D2',
+  'F', "F'", 'F2',
+  'B', "B'", 'B2',
+]
+
+type TableSymmetry = {
+  /** 像的第 i 格来自原状态的第 src[i] 格 */
+  src: Uint8Array
+  /** 按 URFDLB 字符编码（charCode）索引的颜色映射 */
+  colorMap: Map<string, string>
+  /** 代表元上的转动下标 -> 原状态上的转动下标 */
+  moveBack: Uint8Array
+}
+
+export type ShallowSolutionTable = {
+  maxDepth: number
+  entryCount: number
+  capacity: number
+  symmetries: TableSymmetry[]
+  slots: Uint8Array
+  recordSize: number
+}
+
+/** 解析表文件；格式或版本不符时抛错 */
+export function parseShallowSolutionTable(buffer: ArrayBuffer): ShallowSolutionTable {
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(
+    view.getUint8(0),
+    view.getUint8(1),
+    view.getUint8(2),
+    view.getUint8(3)
+  )
+  const version = view.getUint16(4, true)
+  if (magic !== MAGIC || version !== VERSION) {
+    throw new Error(`浅层解表格式不符：magic=${magic}, version=${version}`)
+  }
+  const maxDepth = view.getUint8(6)
+  const symCount = view.getUint8(7)
+  const entryCount = view.getUint32(8, true)
+  const capacity = view.getUint32(12, true)
+
+  const symmetries: TableSymmetry[] = []
+  let offset = HEADER_SIZE
+  for (let k = 0; k < symCount; k++) {
+    const src = new Uint8Array(buffer, offset, 54)
+    const colors = new Uint8Array(buffer, offset + 54, 6)
+    const moveBack = new Uint8Array(buffer, offset + 60, TABLE_MOVES.length)
+    const colorMap = new Map<string, string>()
+    for (let f = 0; f < 6; f++) {
+      colorMap.set(FACE_CHARS[f], FACE_CHARS[colors[f]])
+    }
+    symmetries.push({ src, colorMap, moveBack })
+    offset += 54 + 6 + TABLE_MOVES.length
+  }
+
+  const recordSize = KEY_SIZE + 1 + maxDepth
+  const slots = new Uint8Array(buffer, offset, capacity * recordSize)
+  return { maxDepth, entryCount, capacity, symmetries, slots, recordSize }
+}
+
+function packCubestring(cubestring: string): Uint8Array {
+  const key = new Uint8Array(KEY_SIZE)
+  let bit = 0
+  for (let i = 0; i < 54; i++) {
+    if (CENTER_INDEXES.has(i)) continue
+    const v = FACE_CHARS.indexOf(cubestring[i])
+    const byte = bit >> 3
+    const shift = bit & 7
+    key[byte] |= (v << shift) & 0xff
+    if (shift > 5) key[byte + 1] |= v >> (8 - shift)
+    bit += 3
+  }
+  return key
+}
+
+function fnv1a32(bytes: Uint8Array): number {
+  let h = 0x811c9dc5
+  for (let i = 0; i < bytes.length; i++) {
+    h ^= bytes[i]
+    h = Math.imul(h, 0x01000193) >>> 0
+  }
+  return h
+}
+
+function symmetryImage(cubestring: string, sym: TableSymmetry): string {
+  let out = ''
+  for (let i = 0; i < 54; i++) {
+    out += sym.colorMap.get(cubestring[sym.src[i]])!
+  }
+  return out
+}
+
+/**
+ * 查询还原 cubestring 的最优解（HTM 步数最少）；深度超出表或 cubestring 非法时返回 null。
+ */
+export function lookupShallowSolution(
+  table: ShallowSolutionTable,
+  cubestring: string
+): Move[] | null {
+  const s = cubestring.trim()
+  if (s.length !== 54) return null
+  for (let i = 0; i < 54; i++) {
+    if (!FACE_CHARS.includes(s[i])) return null
+  }
+
+  let canon = ''
+  let symIndex = -1
+  for (let k = 0; k < table.symmetries.length; k++) {
+    const image = symmetryImage(s, table.symmetries[k])
+    if (symIndex < 0 || image < canon) {
+      canon = image
+      symIndex = k
+    }
+  }
+
+  const key = packCubestring(canon)
+  const mask = table.capacity - 1
+  let slot = fnv1a32(key) & mask
+  for (let probe = 0; probe < table.capacity; probe++) {
+    const offset = slot * table.recordSize
+    const length = table.slots[offset + KEY_SIZE]
+    if (length === EMPTY_SLOT) return null
+    let match = true
+    for (let i = 0; i < KEY_SIZE; i++) {
+      if (table.slots[offset + i] !== key[i]) {
+        match = false
+        break
+      }
+    }
+    if (match) {
+      const moveBack = table.symmetries[symIndex].moveBack
+      const moves: Move[] = []
+      for (let i = 0; i < length; i++) {
+        moves.push(TABLE_MOVES[moveBack[table.slots[offset + KEY_SIZE + 1 + i]]])
+      }
+      return moves
+    }
+    slot = (slot + 1) & mask
+  }
+  return null
+}
+
+let registeredTable: ShallowSolutionTable | null = null
+
+/** 注册供 solveCube 在任何搜索前查询的表；传 null 取消 */
+export function setShallowSolutionTable(table: ShallowSolutionTable | null): void {
+  registeredTable = table
+}
+
+export function getShallowSolutionTable(): ShallowSolutionTable | null {
+  return registeredTable
+}
+
+/** 从 URL 获取表文件、解析并注册（页面或服务启动时调用一次） */
+export async function loadShallowSolutionTable(url: string): Promise<ShallowSolutionTable> {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error(`浅层解表加载失败：${response.status} ${url}`)
+  }
+  const table = parseShallowSolutionTable(await response.arrayBuffer())
+  setShallowSolutionTable(table)
+  console.log(`浅层解表已加载：${table.entryCount} 个代表元，最大深度 ${table.maxDepth}`)
+  return table
+}
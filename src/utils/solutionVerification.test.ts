@@ -0,0 +1,61 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring, SOLVED_CUBESTRING } from './cubestringCodec'
+import { verifySolution, verifySolutionsBatch } from './solutionVerification'
+
+const MOVES: Move[] = ['R', 'L', 'U', 'D', 'F', 'B'].flatMap((f) =>
+  ['', "'", '2'].map((s) => (f + s) as Move)
+)
+
+function inverse(moves: readonly Move[]): Move[] {
+  return [...moves].reverse().map((m) =>
+    m.endsWith('2') ? m : m.endsWith("'") ? (m[0] as Move) : (`${m}'` as Move)
+  )
+}
+
+function scramble(seed: number, length: number): Move[] {
+  let x = seed
+  const out: Move[] = []
+  for (let i = 0; i < length; i++) {
+    x = (x * 1103515245 + 12345) % 2147483648
+    out.push(MOVES[x % MOVES.length])
+  }
+  return out
+}
+
+describe('batched solution verification', () => {
+  it('agrees with applyMovesToCubestring row by row', () => {
+    const cubestrings: string[] = []
+    const solutions: (string | Move[])[] = []
+    const expected: boolean[] = []
+    for (let i = 0; i < 40; i++) {
+      const moves = scramble(i + 1, 1 + (i % 15))
+      const start = applyMovesToCubestring(SOLVED_CUBESTRING, moves)
+      // 偶数行给正确解，奇数行去掉最后一步
+      const solution = i % 2 === 0 ? inverse(moves) : inverse(moves).slice(0, -1)
+      cubestrings.push(start)
+      solutions.push(i % 4 === 0 ? solution.join(' ') : solution)
+      expected.push(applyMovesToCubestring(start, solution) === SOLVED_CUBESTRING)
+    }
+
+    const { passed, lengths, stats } = verifySolutionsBatch(cubestrings, solutions)
+    expect(Array.from(passed, (p) => p === 1)).toEqual(expected)
+    expect(lengths[0]).toBe(1)
+    expect(stats.total).toBe(40)
+    expect(stats.passed).toBe(expected.filter(Boolean).length)
+    expect(stats.lengthHistogram.reduce((a, b) => a + b, 0)).toBe(stats.passed)
+  })
+
+  it('fails unparsable rows without throwing', () => {
+    const one = applyMovesToCubestring(SOLVED_CUBESTRING, ['R'])
+    const { passed, stats } = verifySolutionsBatch(
+      [one, one, 'UUU', SOLVED_CUBESTRING],
+      ["R'", 'R3', "R'", '']
+    )
+    expect(Array.from(passed)).toEqual([1, 0, 0, 1])
+    expect(stats.invalid).toBe(2)
+    expect(stats.minLength).toBe(0)
+    expect(stats.maxLength).toBe(1)
+    expect(verifySolution(one, ['R2'])).toBe(false)
+  })
+})
@@ -0,0 +1,193 @@
+/**
+ * 批量验证解法：把成千上万个 (cubestring, solution) 放进同一块 Uint8Array，
+ * 用预计算的 54 格置换表逐步推进，而不是逐行走 `applyMovesToCubestring` 的面模型复制。
+ * Python 侧对应 tools/batch_verify.py（NumPy）。
+ */
+
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring } from './cubestringCodec'
+
+const FACE_CHARS = 'URFDLB'
+
+/** 与 cubeSolver 的 allMoves、tools/cube_facelets.py 的 MOVES 顺序一致 */
+const VERIFY_MOVES: readonly Move[] = [
+  'R', "R'", 'R2',
+  'L', "L'", 'L2',
+  'U', "U'", 'U2',
+  'D', "D'", 'D2',
+  'F', "F'", 'F2',
+  'B', "B'", 'B2',
+]
+
+const MOVE_INDEX = new Map<string, number>(VERIFY_MOVES.map((m, i) => [m, i]))
+
+/** 字符编码 -> 面序号（URFDLB），非法字符为 -1 */
+const CHAR_CODE_TO_FACE = new Int8Array(128).fill(-1)
+for (let f = 0; f < 6; f++) {
+  CHAR_CODE_TO_FACE[FACE_CHARS.charCodeAt(f)] = f
+}
+
+let movePermutations: Uint8Array[] | null = null
+
+/**
+ * 每个转动的 54 格置换：转动后第 i 格 = 转动前第 src[i] 格。
+ * 用三个以 6 进制编码格子下标的探针状态经 `applyMovesToCubestring` 反推，保证与面模型转动一致。
+ */
+function getMovePermutations(): Uint8Array[] {
+  if (movePermutations) return movePermutations
+  const probes = [1, 6, 36].map((weight) => {
+    let s = ''
+    for (let i = 0; i < 54; i++) s += FACE_CHARS[Math.floor(i / weight) % 6]
+    return s
+  })
+  movePermutations = VERIFY_MOVES.map((move) => {
+    const src = new Uint8Array(54)
+    probes.forEach((probe, p) => {
+      const moved = applyMovesToCubestring(probe, [move])
+      for (let i = 0; i < 54; i++) {
+        src[i] += FACE_CHARS.indexOf(moved[i]) * 6 ** p
+      }
+    })
+    return src
+  })
+  return movePermutations
+}
+
+function parseSolution(solution: string | readonly Move[]): number[] | null {
+  const tokens =
+    typeof solution === 'string' ? solution.trim().split(/\s+/).filter(Boolean) : solution
+  const out: number[] = []
+  for (const token of tokens) {
+    const m = MOVE_INDEX.get(token)
+    if (m === undefined) return null
+    out.push(m)
+  }
+  return out
+}
+
+export type BatchVerificationStats = {
+  total: number
+  passed: number
+  failed: number
+  /** cubestring 或解法无法解析的行（也计入 failed） */
+  invalid: number
+  /** 以下长度统计只计通过的行 */
+  minLength: number
+  maxLength: number
+  meanLength: number
+  /** lengthHistogram[k] = 长度为 k 的通过行数 */
+  lengthHistogram: number[]
+}
+
+export type BatchVerificationResult = {
+  /** 每行 1 = 还原到 SOLVED_CUBESTRING，0 = 未还原或无法解析 */
+  passed: Uint8Array
+  /** 每行解法步数（无法解析的行为 0） */
+  lengths: Uint16Array
+  stats: BatchVerificationStats
+}
+
+/**
+ * 验证 solutions[i] 是否把 cubestrings[i] 还原。解法可为空格分隔的字符串或 Move 数组。
+ * 所有行按步号同步推进：第 t 轮对所有长度 > t 的行应用各自第 t 步的置换。
+ */
+export function verifySolutionsBatch(
+  cubestrings: readonly string[],
+  solutions: readonly (string | readonly Move[])[]
+): BatchVerificationResult {
+  if (cubestrings.length !== solutions.length) {
+    throw new Error(
+      `cubestrings 与 solutions 行数不一致：${cubestrings.length} vs ${solutions.length}`
+    )
+  }
+  const n = cubestrings.length
+  const perms = getMovePermutations()
+  const states = new Uint8Array(n * 54)
+  const lengths = new Uint16Array(n)
+  const valid = new Uint8Array(n)
+  const parsed: (number[] | null)[] = new Array(n)
+  let maxSteps = 0
+
+  for (let r = 0; r < n; r++) {
+    const s = cubestrings[r].trim()
+    const moves = parseSolution(solutions[r])
+    parsed[r] = moves
+    if (s.length !== 54 || !moves) continue
+    let ok = true
+    for (let i = 0; i < 54; i++) {
+      const code = s.charCodeAt(i)
+      const face = code < 128 ? CHAR_CODE_TO_FACE[code] : -1
+      if (face < 0) {
+        ok = false
+        break
+      }
+      states[r * 54 + i] = face
+    }
+    if (!ok) continue
+    valid[r] = 1
+    lengths[r] = moves.length
+    if (moves.length > maxSteps) maxSteps = moves.length
+  }
+
+  const scratch = new Uint8Array(54)
+  for (let t = 0; t < maxSteps; t++) {
+    for (let r = 0; r < n; r++) {
+      if (!valid[r] || lengths[r] <= t) continue
+      const src = perms[parsed[r]![t]]
+      const base = r * 54
+      for (let i = 0; i < 54; i++) scratch[i] = states[base + src[i]]
+      states.set(scratch, base)
+    }
+  }
+
+  const passed = new Uint8Array(n)
+  const lengthHistogram: number[] = new Array(maxSteps + 1).fill(0)
+  let passedCount = 0
+  let invalid = 0
+  let minLength = Infinity
+  let maxLength = 0
+  let lengthSum = 0
+  for (let r = 0; r < n; r++) {
+    if (!valid[r]) {
+      invalid++
+      lengths[r] = 0
+      continue
+    }
+    let solved = true
+    for (let i = 0; i < 54; i++) {
+      // 已还原时第 i 格的面序号 = floor(i / 9)
+      if (states[r * 54 + i] !== ((i / 9) | 0)) {
+        solved = false
+        break
+      }
+    }
+    if (!solved) continue
+    passed[r] = 1
+    passedCount++
+    const len = lengths[r]
+    lengthHistogram[len]++
+    lengthSum += len
+    if (len < minLength) minLength = len
+    if (len > maxLength) maxLength = len
+  }
+
+  return {
+    passed,
+    lengths,
+    stats: {
+      total: n,
+      passed: passedCount,
+      failed: n - passedCount,
+      invalid,
+      minLength: passedCount > 0 ? minLength : 0,
+      maxLength,
+      meanLength: passedCount > 0 ? lengthSum / passedCount : 0,
+      lengthHistogram,
+    },
+  }
+}
+
+/** 单行便捷入口，与 `applyMovesToCubestring(start, moves) === SOLVED_CUBESTRING` 等价 */
+export function verifySolution(cubestring: string, solution: string | readonly Move[]): boolean {
+  return verifySolutionsBatch([cubestring], [solution]).passed[0] === 1
+}
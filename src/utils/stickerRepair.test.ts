@@ -0,0 +1,61 @@
+import { describe, expect, it } from 'vitest'
+import type { Move } from './cubeTypes'
+import { applyMovesToCubestring, SOLVED_CUBESTRING } from './cubestringCodec'
+import { faceColorsToCubieBasedState } from './faceColorsToCubieBased'
+import { repairCubestring } from './stickerRepair'
+
+const SCRAMBLED = applyMovesToCubestring(SOLVED_CUBESTRING, [
+  'R', "U'", 'F2', 'D', 'L2', 'B', "R'", 'U2', 'F', "D'", 'L', 'B2',
+] as Move[])
+
+function withStickers(cubestring: string, changes: Record<number, string>): string {
+  return [...cubestring].map((c, i) => changes[i] ?? c).join('')
+}
+
+function confidenceWithLow(indexes: number[], low = 0.2, high = 0.9): number[] {
+  return Array.from({ length: 54 }, (_, i) => (indexes.includes(i) ? low : high))
+}
+
+describe('sticker repair', () => {
+  it('keeps a valid scan unchanged as the top candidate', () => {
+    const { candidates } = repairCubestring(SCRAMBLED)
+    expect(candidates[0].cubestring).toBe(SCRAMBLED)
+    expect(candidates[0].edits).toEqual([])
+    expect(candidates[0].cost).toBe(0)
+  })
+
+  it('restores a single misread sticker using its low confidence', () => {
+    const wrong = SCRAMBLED[7] === 'F' ? 'R' : 'F'
+    const scanned = withStickers(SCRAMBLED, { 7: wrong })
+    const { candidates } = repairCubestring(scanned, confidenceWithLow([7]))
+    expect(candidates[0].cubestring).toBe(SCRAMBLED)
+    expect(candidates[0].edits).toHaveLength(1)
+    expect(candidates[0].edits[0]).toMatchObject({ index: 7, face: 'U', row: 2, col: 1 })
+  })
+
+  it('untwists a corner whose stickers all read with low confidence', () => {
+    // URF 角块贴纸 8, 9, 20 循环移位：颜色计数仍正确，但扭转和不为 0
+    const twisted = withStickers(SCRAMBLED, {
+      8: SCRAMBLED[20],
+      9: SCRAMBLED[8],
+      20: SCRAMBLED[9],
+    })
+    const { candidates } = repairCubestring(twisted, confidenceWithLow([8, 9, 20]))
+    expect(candidates[0].cubestring).toBe(SCRAMBLED)
+    expect(candidates[0].edits.map((e) => e.index).sort((a, b) => a - b)).toEqual([8, 9, 20])
+  })
+
+  it('fills unrecognized stickers and returns ranked, convertible candidates', () => {
+    const scanned = withStickers(SCRAMBLED, { 0: '?', 30: '?', 52: '?' })
+    const { candidates } = repairCubestring(scanned, undefined, { maxCandidates: 3 })
+    expect(candidates[0].cubestring).toBe(SCRAMBLED)
+    expect(candidates[0].cost).toBe(0)
+    expect(candidates.length).toBeLessThanOrEqual(3)
+    for (let i = 1; i < candidates.length; i++) {
+      expect(candidates[i].cost).toBeGreaterThanOrEqual(candidates[i - 1].cost)
+    }
+    for (const candidate of candidates) {
+      expect(() => faceColorsToCubieBasedState(candidate.cubeState)).not.toThrow()
+    }
+  })
+})
@@ -0,0 +1,328 @@
+/**
+ * 扫描结果的贴纸自动修复
+ *
+ * 摄像头识别出的状态常有一两个贴纸颜色错误，导致 9 色计数、中心或
+ * `faceColorsToCubieBasedState` 校验失败。这里求「改动代价最小、且可还原」的贴纸修改：
+ * - 每个贴纸的改动代价取 `recognizeColor` 给出的置信度（越确信越贵），未识别（black）的贴纸代价为 0
+ * - 在角块 / 棱块槽位上枚举（块, 朝向）分配，分支限界剪枝
+ * - 可还原约束：角块扭转和 ≡ 0 (mod 3)、棱块翻转和为偶数、角块与棱块置换奇偶相同
+ * 返回按代价排序的若干候选（含原状态本身已合法时的零修改候选）。
+ *
+ * 贴纸下标与 Kociemba cubestring 一致（URFDLB，每面行优先）。
+ */
+
+import type { CubeState, Face, FaceColor } from './cubeTypes'
+import { FACE_COLORS } from './cubeTypes'
+import type { CubeInputState } from './cubeInputConverter'
+import { CORNER_COLORS, CORNER_FACELETS, EDGE_COLORS, EDGE_FACELETS, FACELET_FACES } from './faceletTables'
+
+const FACE_CHARS = 'URFDLB'
+const CENTER_INDEXES = [4, 13, 22, 31, 40, 49]
+const UNKNOWN = -1
+
+export interface StickerEdit {
+  /** cubestring 下标 0-53 */
+  index: number
+  face: Face
+  row: number
+  col: number
+  from: FaceColor
+  to: FaceColor
+  cost: number
+}
+
+export interface StickerRepairCandidate {
+  cubestring: string
+  cubeState: CubeState
+  edits: StickerEdit[]
+  /** 所有修改的代价之和 */
+  cost: number
+}
+
+export interface StickerRepairOptions {
+  /** 返回的候选数上限，默认 5 */
+  maxCandidates?: number
+  /** 单个贴纸的最低改动代价（避免置信度 0 的贴纸可被随意改），默认 0.05 */
+  minEditCost?: number
+}
+
+export interface StickerRepairResult {
+  /** 按 cost 升序 */
+  candidates: StickerRepairCandidate[]
+  elapsedMs: number
+}
+
+/** 同一奇偶类下的部分解：每个槽位选定的（块, 朝向） */
+type PieceAssignment = { cost: number; pieces: number[]; orientations: number[] }
+
+type PieceSearchSpec = {
+  facelets: readonly (readonly number[])[]
+  colors: readonly (readonly number[])[]
+  /** 朝向取值个数：角块 3，棱块 2 */
+  twist: number
+}
+
+function placementCost(
+  stickers: Int8Array,
+  editCost: Float64Array,
+  facelets: readonly number[],
+  colors: readonly number[],
+  orientation: number
+): number {
+  const n = facelets.length
+  let cost = 0
+  for (let k = 0; k < n; k++) {
+    const index = facelets[(k + orientation) % n]
+    if (stickers[index] !== colors[k]) cost += editCost[index]
+  }
+  return cost
+}
+
+function permutationParity(pieces: readonly number[]): number {
+  let parity = 0
+  for (let i = 0; i < pieces.length; i++) {
+    for (let j = i + 1; j < pieces.length; j++) {
+      if (pieces[i] > pieces[j]) parity ^= 1
+    }
+  }
+  return parity
+}
+
+/**
+ * 分支限界枚举一类块（角或棱）的分配，按置换奇偶分别保留代价最小的 limit 个。
+ * 朝向和约束在最后一个槽位处直接决定朝向。
+ */
+function searchPieceAssignments(
+  spec: PieceSearchSpec,
+  stickers: Int8Array,
+  editCost: Float64Array,
+  limit: number
+): [PieceAssignment[], PieceAssignment[]] {
+  const slotCount = spec.facelets.length
+  // costs[slot][piece * twist + orientation]
+  const costs = spec.facelets.map((facelets) => {
+    const row: number[] = []
+    for (let p = 0; p < slotCount; p++) {
+      for (let o = 0; o < spec.twist; o++) {
+        row.push(placementCost(stickers, editCost, facelets, spec.colors[p], o))
+      }
+    }
+    return row
+  })
+  // 每个槽位的选项按代价升序，先找到便宜的叶子以尽早收紧界
+  const options = costs.map((row) =>
+    row.map((_, option) => option).sort((a, b) => row[a] - row[b])
+  )
+  // suffixBound[s] = 槽位 s.. 的最小代价之和（忽略块的互斥），作为下界
+  const suffixBound = new Float64Array(slotCount + 1)
+  for (let s = slotCount - 1; s >= 0; s--) {
+    suffixBound[s] = suffixBound[s + 1] + costs[s][options[s][0]]
+  }
+
+  const best: [PieceAssignment[], PieceAssignment[]] = [[], []]
+  const pieces: number[] = new Array(slotCount)
+  const orientations: number[] = new Array(slotCount)
+  const used = new Uint8Array(slotCount)
+
+  const worstKept = (): number => {
+    if (best[0].length < limit || best[1].length < limit) return Infinity
+    return Math.max(best[0][limit - 1].cost, best[1][limit - 1].cost)
+  }
+
+  const keep = (cost: number) => {
+    const list = best[permutationParity(pieces)]
+    if (list.length === limit && list[limit - 1].cost <= cost) return
+    const entry = { cost, pieces: [...pieces], orientations: [...orientations] }
+    let i = list.length
+    while (i > 0 && list[i - 1].cost > cost) i--
+    list.splice(i, 0, entry)
+    if (list.length > limit) list.pop()
+  }
+
+  const visit = (slot: number, cost: number, twistSum: number) => {
+    if (cost + suffixBound[slot] >= worstKept()) return
+    if (slot === slotCount - 1) {
+      const o = (spec.twist - (twistSum % spec.twist)) % spec.twist
+      for (let p = 0; p < slotCount; p++) {
+        if (used[p]) continue
+        pieces[slot] = p
+        orientations[slot] = o
+        keep(cost + costs[slot][p * spec.twist + o])
+      }
+      return
+    }
+    for (const option of options[slot]) {
+      const p = Math.floor(option / spec.twist)
+      if (used[p]) continue
+      const next = cost + costs[slot][option]
+      if (next + suffixBound[slot + 1] >= worstKept()) break
+      used[p] = 1
+      pieces[slot] = p
+      orientations[slot] = option % spec.twist
+      visit(slot + 1, next, twistSum + orientations[slot])
+      used[p] = 0
+    }
+  }
+
+  visit(0, 0, 0)
+  return best
+}
+
+function colorToFaceIndex(color: FaceColor): number {
+  const face = FACELET_FACES.find((f) => FACE_COLORS[f] === color)
+  return face ? FACE_CHARS.indexOf(face) : UNKNOWN
+}
+
+function stickersToCubeState(stickers: ArrayLike<number>): CubeState {
+  const state = {} as CubeState
+  FACELET_FACES.forEach((face, f) => {
+    state[face] = [0, 1, 2].map((row) =>
+      [0, 1, 2].map((col) => FACE_COLORS[FACELET_FACES[stickers[f * 9 + row * 3 + col]]])
+    )
+  })
+  return state
+}
+
+function stickerColor(value: number): FaceColor {
+  return value === UNKNOWN ? 'black' : FACE_COLORS[FACELET_FACES[value]]
+}
+
+/**
+ * 修复 54 个贴纸（面序号，UNKNOWN = 未识别）。confidence[i] ∈ [0, 1]，缺省视为 1。
+ */
+function repairStickers(
+  stickers: Int8Array,
+  confidence: ArrayLike<number> | undefined,
+  options: StickerRepairOptions | undefined
+): StickerRepairResult {
+  const start = performance.now()
+  const limit = Math.max(1, options?.maxCandidates ?? 5)
+  const minEditCost = options?.minEditCost ?? 0.05
+  const editCost = new Float64Array(54)
+  for (let i = 0; i < 54; i++) {
+    editCost[i] =
+      stickers[i] === UNKNOWN ? 0 : Math.max(minEditCost, Math.min(1, confidence?.[i] ?? 1))
+  }
+
+  const repaired = Int8Array.from(stickers)
+  let centerCost = 0
+  CENTER_INDEXES.forEach((index, f) => {
+    if (stickers[index] !== f) centerCost += editCost[index]
+    repaired[index] = f
+  })
+
+  const corners = searchPieceAssignments(
+    { facelets: CORNER_FACELETS, colors: CORNER_COLORS, twist: 3 },
+    stickers,
+    editCost,
+    limit
+  )
+  const edges = searchPieceAssignments(
+    { facelets: EDGE_FACELETS, colors: EDGE_COLORS, twist: 2 },
+    stickers,
+    editCost,
+    limit
+  )
+
+  // 角、棱的置换奇偶必须相同
+  const pairs: { cost: number; corner: PieceAssignment; edge: PieceAssignment }[] = []
+  for (const parity of [0, 1]) {
+    for (const corner of corners[parity]) {
+      for (const edge of edges[parity]) {
+        pairs.push({ cost: centerCost + corner.cost + edge.cost, corner, edge })
+      }
+    }
+  }
+  pairs.sort((a, b) => a.cost - b.cost)
+
+  const candidates = pairs.slice(0, limit).map(({ cost, corner, edge }) => {
+    const result = Int8Array.from(repaired)
+    corner.pieces.forEach((p, s) => {
+      for (let k = 0; k < 3; k++) {
+        result[CORNER_FACELETS[s][(k + corner.orientations[s]) % 3]] = CORNER_COLORS[p][k]
+      }
+    })
+    edge.pieces.forEach((p, s) => {
+      for (let k = 0; k < 2; k++) {
+        result[EDGE_FACELETS[s][(k + edge.orientations[s]) % 2]] = EDGE_COLORS[p][k]
+      }
+    })
+    const edits: StickerEdit[] = []
+    for (let i = 0; i < 54; i++) {
+      if (result[i] === stickers[i]) continue
+      const f = Math.floor(i / 9)
+      edits.push({
+        index: i,
+        face: FACELET_FACES[f],
+        row: Math.floor((i % 9) / 3),
+        col: i % 3,
+        from: stickerColor(stickers[i]),
+        to: stickerColor(result[i]),
+        cost: editCost[i],
+      })
+    }
+    return {
+      cubestring: Array.from(result, (v) => FACE_CHARS[v]).join(''),
+      cubeState: stickersToCubeState(result),
+      edits,
+      cost,
+    }
+  })
+
+  return { candidates, elapsedMs: performance.now() - start }
+}
+
+/**
+ * 修复 cubestring。非 URFDLB 字符（如 '?'）视为未识别贴纸；
+ * confidence 为 54 个与 cubestring 同序的置信度。
+ */
+export function repairCubestring(
+  cubestring: string,
+  confidence?: ArrayLike<number>,
+  options?: StickerRepairOptions
+): StickerRepairResult {
+  const s = cubestring.trim()
+  if (s.length !== 54) {
+    throw new Error(`cubestring 长度应为 54，实际为 ${s.length}`)
+  }
+  const stickers = new Int8Array(54)
+  for (let i = 0; i < 54; i++) stickers[i] = FACE_CHARS.indexOf(s[i])
+  return repairStickers(stickers, confidence, options)
+}
+
+/**
+ * 修复面颜色状态；confidence 为每面 3x3 置信度（`recognizeFaceColors` 的输出），缺省视为 1。
+ */
+export function repairCubeState(
+  cubeState: CubeState,
+  confidence?: Partial<Record<Face, number[][]>>,
+  options?: StickerRepairOptions
+): StickerRepairResult {
+  const stickers = new Int8Array(54)
+  const flatConfidence = new Float64Array(54).fill(1)
+  FACELET_FACES.forEach((face, f) => {
+    for (let row = 0; row < 3; row++) {
+      for (let col = 0; col < 3; col++) {
+        const i = f * 9 + row * 3 + col
+        stickers[i] = colorToFaceIndex(cubeState[face][row][col])
+        const c = confidence?.[face]?.[row]?.[col]
+        if (c !== undefined) flatConfidence[i] = c
+      }
+    }
+  })
+  return repairStickers(stickers, flatConfidence, options)
+}
+
+/** 摄像头录入状态的便捷入口：颜色与置信度都取自 CubeInputState */
+export function repairCubeInputState(
+  inputState: CubeInputState,
+  options?: StickerRepairOptions
+): StickerRepairResult {
+  const cubeState = {} as CubeState
+  const confidence = {} as Record<Face, number[][]>
+  for (const face of FACELET_FACES) {
+    cubeState[face] = inputState.faces[face].colors
+    confidence[face] = inputState.faces[face].confidence
+  }
+  return repairCubeState(cubeState, confidence, options)
+}
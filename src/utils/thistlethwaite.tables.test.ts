@@ -0,0 +1,32 @@
+import { describe, expect, it } from 'vitest'
+import {
+  SOLVED_CUBESTRING,
+  applyMovesToCubestring,
+  cubestringToCubeState,
+  cubieFromCubestring,
+} from './cubestringCodec'
+import { faceColorsToCubieBasedState } from './faceColorsToCubieBased'
+import {
+  THISTLETHWAITE_TABLE_PHASES,
+  isThistlethwaiteTableReady,
+  warmupThistlethwaiteTables,
+} from './thistlethwaite'
+
+describe('lazy Thistlethwaite tables', () => {
+  it('validation and conversion paths build no solver tables', () => {
+    const start = applyMovesToCubestring(SOLVED_CUBESTRING, ['R', "U'", 'F2'])
+    cubieFromCubestring(start)
+    faceColorsToCubieBasedState(cubestringToCubeState(start))
+
+    for (const phase of THISTLETHWAITE_TABLE_PHASES) {
+      expect(isThistlethwaiteTableReady(phase)).toBe(false)
+    }
+  })
+
+  it('warmup builds only the requested phase', async () => {
+    const ready = await warmupThistlethwaiteTables({ phases: ['phase0'] })
+    expect(ready).toEqual(['phase0'])
+    expect(isThistlethwaiteTableReady('phase0')).toBe(true)
+    expect(isThistlethwaiteTableReady('phase1')).toBe(false)
+  })
+})
@@ -10,6 +10,8 @@ import {
   FACE_COLORS,
 } from './cubeTypes'
 import { createSolvedCubieBasedCube, applyMove, cloneCubieBasedState } from './cubieBasedCubeLogic'
+import { layerSlotsOfMove, pieceSlotIndex, slotOfCoordinate } from './idaStarHelpers'
+import type { PieceSlotIndex } from './idaStarHelpers'
 
 /**
  * Thistlethwaite 算法的四个阶段
@@ -1043,43 +1045,80 @@ function isInG2(state: CubieBasedCubeState): boolean {
     encodeSliceCombinationIndex(state) === sliceMaskToIndex![HOME_E_SLICE_MASK]
 }
 
-/** 角块朝向错误个数（与 isInG2 判定一致；仅当已在 G1 时有意义） */
-function wrongCornerOrientationCount(state: CubieBasedCubeState): number {
-  let n = 0
-  for (const corner of Object.values(state.corners)) {
-    if (!isCornerOriented(corner)) n++
-  }
-  return n
+/**
+ * 阶段 0→1 / 1→2 IDA* 启发式的逐块计数：棱错向数、角错向数、不在 E 层的 E-slice 棱数，并携带槽位索引。
+ * 一次面转只改动该层 4 角 4 棱，子结点计数由父结点增量得到，每个结点只读这 8 块。
+ */
+type OrientationCounters = PieceSlotIndex & {
+  wrongEdges: number
+  wrongCorners: number
+  sliceEdgesOutside: number
 }
 
-/** 棱槽朝向错误个数（与 isInG1 一致） */
-function wrongEdgeOrientationCount(state: CubieBasedCubeState): number {
-  const solved = createSolvedCubieBasedCube()
-  const byCoord = new Map<string, EdgeCubie>()
-  for (const e of Object.values(state.edges)) {
-    byCoord.set(e.coordinate.join(','), e)
+function addCornerOrientation(corner: CornerCubie, sign: 1 | -1, out: OrientationCounters): void {
+  if (!isCornerOriented(corner)) out.wrongCorners += sign
+}
+
+function addEdgeOrientation(edge: EdgeCubie, sign: 1 | -1, out: OrientationCounters): void {
+  const slot = slotOfCoordinate(edge.coordinate)
+  const slotId = slot < 0 ? undefined : EDGE_IDS[slot]
+  if (!slotId || edgeOrientationWrongAtSlot(edge, slotId)) out.wrongEdges += sign
+  if (E_SLICE_EDGE_IDS.has(edge.id) && (!slotId || !E_SLICE_EDGE_IDS.has(slotId))) {
+    out.sliceEdgesOutside += sign
   }
-  let n = 0
-  for (const id of EDGE_IDS) {
-    const slotCoord = solved.edges[id].coordinate as [number, number, number]
-    const edge = byCoord.get(slotCoord.join(','))
-    if (!edge) return 12
-    if (edgeOrientationWrongAtSlot(edge, id)) n++
+}
+
+function orientationCounters(state: CubieBasedCubeState): OrientationCounters {
+  const out: OrientationCounters = { wrongEdges: 0, wrongCorners: 0, sliceEdgesOutside: 0, ...pieceSlotIndex(state) }
+  for (const id of CORNER_IDS) addCornerOrientation(state.corners[id], 1, out)
+  for (const id of EDGE_IDS) addEdgeOrientation(state.edges[id], 1, out)
+  return out
+}
+
+/** 经槽位索引取出转动层的 8 块：父结点计数 − 其转动前贡献 + 其转动后贡献（其余块不动） */
+function orientationCountersAfterMove(
+  parent: OrientationCounters,
+  before: CubieBasedCubeState,
+  after: CubieBasedCubeState,
+  move: Move
+): OrientationCounters {
+  const layer = layerSlotsOfMove(move)
+  const out: OrientationCounters = {
+    ...parent,
+    cornerAt: parent.cornerAt.slice(),
+    edgeAt: parent.edgeAt.slice(),
+  }
+  for (const slot of layer.corners) {
+    const id = parent.cornerAt[slot]
+    addCornerOrientation(before.corners[id], -1, out)
+    addCornerOrientation(after.corners[id], 1, out)
+    out.cornerAt[slotOfCoordinate(after.corners[id].coordinate)] = id
+  }
+  for (const slot of layer.edges) {
+    const id = parent.edgeAt[slot]
+    addEdgeOrientation(before.edges[id], -1, out)
+    addEdgeOrientation(after.edges[id], 1, out)
+    out.edgeAt[slotOfCoordinate(after.edges[id].coordinate)] = id
   }
-  return n
+  return out
+}
+
+/** G0→G1：单步最多影响 4 条棱的朝向（同一面一层）；G1 ⇔ 12 槽均无错向棱 */
+function heuristicG0ToG1FromCounters(c: OrientationCounters): number {
+  return Math.ceil(c.wrongEdges / 4)
 }
 
-/** G0→G1：单步最多影响 4 条棱的朝向（同一面一层） */
-function heuristicG0ToG1(state: CubieBasedCubeState): number {
-  if (isInG1(state)) return 0
-  return Math.ceil(wrongEdgeOrientationCount(state) / 4)
+/**
+ * G1→G2：单步最多影响 4 个角块的朝向（同一面一层）；未在 G1 时给 8。
+ * 计数全为 0 时由 isInG2 精确确认目标，故这里只需处理非目标结点。
+ */
+function heuristicG1ToG2FromCounters(c: OrientationCounters): number {
+  if (c.wrongEdges !== 0) return 8
+  return Math.ceil(c.wrongCorners / 4)
 }
 
-/** G1→G2：单步最多影响 4 个角块的朝向（同一面一层） */
-function heuristicG1ToG2(state: CubieBasedCubeState): number {
-  if (isInG2(state)) return 0
-  if (!isInG1(state)) return 8
-  return Math.ceil(wrongCornerOrientationCount(state) / 4)
+function isG2Candidate(c: OrientationCounters): boolean {
+  return c.wrongEdges === 0 && c.wrongCorners === 0 && c.sliceEdgesOutside === 0
 }
 
 /**
@@ -1142,11 +1181,13 @@ async function searchG0ToG1IDA(
   const t0 = Date.now()
   let totalNodes = 0
   let idaRound = 0
-  let threshold = heuristicG0ToG1(start)
+  const startCounters = orientationCounters(start)
+  let threshold = heuristicG0ToG1FromCounters(startCounters)
   let visited = new Map<string, number>()
 
   async function dfs(
     s: CubieBasedCubeState,
+    c: OrientationCounters,
     path: Move[],
     g: number,
     thr: number
@@ -1158,7 +1199,7 @@ async function searchG0ToG1IDA(
       return { found: false, path: [], nextThreshold: Infinity }
     }
 
-    if (isInG1(s)) {
+    if (c.wrongEdges === 0) {
       return { found: true, path: path.slice(), nextThreshold: thr }
     }
     if (g >= maxDepthG) {
@@ -1176,7 +1217,7 @@ async function searchG0ToG1IDA(
       await yieldToBrowser()
     }
 
-    const h = heuristicG0ToG1(s)
+    const h = heuristicG0ToG1FromCounters(c)
     const f = g + h
     if (f > thr) {
       return { found: false, path: [], nextThreshold: f }
@@ -1193,7 +1234,7 @@ async function searchG0ToG1IDA(
       }
       const ns = applyMove(s, move)
       path.push(move)
-      const r = await dfs(ns, path, g + 1, thr)
+      const r = await dfs(ns, orientationCountersAfterMove(c, s, ns, move), path, g + 1, thr)
       path.pop()
       if (r.found) return r
       minNext = Math.min(minNext, r.nextThreshold)
@@ -1210,7 +1251,7 @@ async function searchG0ToG1IDA(
     visited = new Map<string, number>()
     onProgress?.(idaRound, threshold)
 
-    const result = await dfs(start, [], 0, threshold)
+    const result = await dfs(start, startCounters, [], 0, threshold)
     if (result.found) {
       console.log(`阶段 0->1 IDA* 成功：轮次 ${idaRound}，阈值 ${threshold}，累计结点 ${totalNodes}`)
       return result.path
@@ -1243,11 +1284,13 @@ async function searchG1ToG2IDA(
   const t0 = Date.now()
   let totalNodes = 0
   let idaRound = 0
-  let threshold = heuristicG1ToG2(start)
+  const startCounters = orientationCounters(start)
+  let threshold = heuristicG1ToG2FromCounters(startCounters)
   let visited = new Map<string, number>()
 
   async function dfs(
     s: CubieBasedCubeState,
+    c: OrientationCounters,
     path: Move[],
     g: number,
     thr: number
@@ -1259,7 +1302,7 @@ async function searchG1ToG2IDA(
       return { found: false, path: [], nextThreshold: Infinity }
     }
 
-    if (isInG2(s)) {
+    if (isG2Candidate(c) && isInG2(s)) {
       return { found: true, path: path.slice(), nextThreshold: thr }
     }
     if (g >= maxDepthG) {
@@ -1277,7 +1320,7 @@ async function searchG1ToG2IDA(
       await yieldToBrowser()
     }
 
-    const h = heuristicG1ToG2(s)
+    const h = heuristicG1ToG2FromCounters(c)
     const f = g + h
     if (f > thr) {
       return { found: false, path: [], nextThreshold: f }
@@ -1294,7 +1337,7 @@ async function searchG1ToG2IDA(
       }
       const ns = applyMove(s, move)
       path.push(move)
-      const r = await dfs(ns, path, g + 1, thr)
+      const r = await dfs(ns, orientationCountersAfterMove(c, s, ns, move), path, g + 1, thr)
       path.pop()
       if (r.found) return r
       minNext = Math.min(minNext, r.nextThreshold)
@@ -1311,7 +1354,7 @@ async function searchG1ToG2IDA(
     visited = new Map<string, number>()
     onProgress?.(idaRound, threshold)
 
-    const result = await dfs(start, [], 0, threshold)
+    const result = await dfs(start, startCounters, [], 0, threshold)
     if (result.found) {
       console.log(`阶段 1->2 IDA* 成功：轮次 ${idaRound}，阈值 ${threshold}，累计结点 ${totalNodes}`)
       return result.path
@@ -1586,6 +1629,69 @@ export type PhasedIDAStarSearchTuning = {
   yieldEvery?: number
 }
 
+/** 可单独构建、单独缓存的 Thistlethwaite 抽象表（按阶段划分，模块级缓存，页面生命周期内复用） */
+export type ThistlethwaiteTablePhase = 'phase0' | 'phase1' | 'phase2' | 'phase3'
+
+export const THISTLETHWAITE_TABLE_PHASES: readonly ThistlethwaiteTablePhase[] = [
+  'phase0',
+  'phase1',
+  'phase2',
+  'phase3',
+]
+
+const TABLE_BUILDERS: Record<ThistlethwaiteTablePhase, () => void> = {
+  phase0: buildEdgeOrientationParentTable,
+  phase1: buildPhase1ParentTable,
+  phase2: buildPhase2ParentTable,
+  phase3: buildPhase3ParentTable,
+}
+
+/** 该阶段的表是否已在内存中（不会触发构建） */
+export function isThistlethwaiteTableReady(phase: ThistlethwaiteTablePhase): boolean {
+  switch (phase) {
+    case 'phase0':
+      return eoParentTable !== null && eoTableBuildVersion === EO_TABLE_BUILD_VERSION
+    case 'phase1':
+      return phase1ParentTable !== null
+    case 'phase2':
+      return phase2ParentTable !== null
+    case 'phase3':
+      return phase3IndexByKey !== null
+  }
+}
+
+export type ThistlethwaiteWarmupOptions = {
+  /** 要预热的阶段，默认全部（按 phase0→phase3 顺序） */
+  phases?: readonly ThistlethwaiteTablePhase[]
+  /** 启动成本预算（毫秒），超出后不再开始构建下一张表；0 或不传表示不限 */
+  budgetMs?: number
+}
+
+/**
+ * 预热阶段表：按顺序构建，每张表之间让出主线程。
+ * 求解本身仍按需懒构建，未预热的表在首次用到时才付出成本。
+ * 返回调用结束时已就绪的阶段。
+ */
+export async function warmupThistlethwaiteTables(
+  options?: ThistlethwaiteWarmupOptions
+): Promise<ThistlethwaiteTablePhase[]> {
+  const phases = options?.phases ?? THISTLETHWAITE_TABLE_PHASES
+  const budgetMs = options?.budgetMs ?? 0
+  const startTime = Date.now()
+
+  for (const phase of phases) {
+    if (isThistlethwaiteTableReady(phase)) continue
+    if (budgetMs > 0 && Date.now() - startTime >= budgetMs) {
+      console.log(`Thistlethwaite: 预热超出预算（${budgetMs}ms），跳过 ${phase} 及之后的表`)
+      break
+    }
+    TABLE_BUILDERS[phase]()
+    await yieldToBrowser()
+  }
+
+  return phases.filter(isThistlethwaiteTableReady)
+}
+
 /**
  * 分阶段 IDA*：
  * 仍使用 IDA* 的 f=g+h 迭代加深框架，但将随机 3x3 拆成 G0->G1->G2->G3->G4 四个子目标。
@@ -11,12 +11,6 @@ import io
 # 设置输出编码为 UTF-8
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-try:
-    from kociemba import solve
-except ImportError:
-    print("请先安装 kociemba: pip install kociemba")
-    sys.exit(1)
-
 def analyze_cubestring(cubestring):
     """分析 cubestring 的格式"""
     if len(cubestring) != 54:
@@ -47,6 +41,8 @@ def analyze_cubestring(cubestring):
     print("Kociemba 求解")
     print("=" * 60)
     try:
+        # 按需导入：只做格式校验的路径不付出求解器初始化（建表）的开销
+        from kociemba import solve
         solution = solve(cubestring)
         if solution == "":
             print("[OK] 已解决状态（无解）")
@@ -56,6 +52,9 @@ def analyze_cubestring(cubestring):
             print(f"步骤数: {len(moves)}")
             print(f"步骤列表: {moves}")
         return True
+    except ImportError:
+        print("请先安装 kociemba: pip install kociemba")
+        return False
     except Exception as e:
         print(f"[ERROR] 求解失败: {e}")
         return False
@@ -10,12 +10,6 @@ import io
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-try:
-    from kociemba import solve
-except ImportError:
-    print("请先安装 kociemba: pip install kociemba")
-    sys.exit(1)
-
 def validate_cubestring(cubestring):
     """验证 cubestring 的基本格式"""
     print(f"\n验证 cubestring: {cubestring}")
@@ -88,6 +82,8 @@ def validate_cubestring(cubestring):
     # 6. 尝试求解
     print("\n尝试求解:")
     try:
+        # 前面的格式检查不需要求解器，到这里才导入
+        from kociemba import solve
         solution = solve(cubestring)
         if solution == "":
             print("  [OK] 已解决状态（返回空字符串）")
@@ -96,6 +92,9 @@ def validate_cubestring(cubestring):
             print(f"  [OK] 求解成功: {solution}")
             print(f"  步骤数: {len(moves)}")
         return True
+    except ImportError:
+        print("  请先安装 kociemba: pip install kociemba")
+        return False
     except Exception as e:
         print(f"  [ERROR] 求解失败: {e}")
         return False
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量求解 cubestring：先查浅层解表（tools/shallow_table.py 生成），未命中再交给 kociemba。
+
+  python tools/batch_solve.py cubestrings.txt --table shallow-table.bin --out solutions.csv
+
+输入每行一个 cubestring（'-' 表示标准输入），空行与 # 开头的行跳过。
+输出 CSV 列：cubestring, solution, length, source（table / kociemba / error）, ms
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+from shallow_table import ShallowTable
+
+CSV_FIELDS = ('cubestring', 'solution', 'length', 'source', 'ms')
+
+
+def load_kociemba_solve():
+    """按需导入 kociemba：全部命中浅层表时不付出求解器初始化（建表）的开销"""
+    try:
+        from kociemba import solve
+    except ImportError:
+        print('请先安装 kociemba: pip install kociemba', file=sys.stderr)
+        sys.exit(1)
+    return solve
+
+
+def read_cubestrings(stream):
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def solve_all(cubestrings, table=None):
+    """逐个求解，产出 CSV 行字典；表命中时不进入任何搜索"""
+    kociemba_solve = None
+    for cubestring in cubestrings:
+        t0 = time.perf_counter()
+        try:
+            moves = table.lookup(cubestring) if table is not None else None
+            if moves is not None:
+                source = 'table'
+            else:
+                if kociemba_solve is None:
+                    kociemba_solve = load_kociemba_solve()
+                moves = kociemba_solve(cubestring).split()
+                source = 'kociemba'
+        except ValueError as e:
+            print(f'[ERROR] {cubestring}: {e}', file=sys.stderr)
+            moves, source = [], 'error'
+        yield {
+            'cubestring': cubestring,
+            'solution': ' '.join(moves),
+            'length': len(moves),
+            'source': source,
+            'ms': f'{(time.perf_counter() - t0) * 1000:.3f}',
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量求解 cubestring（浅层表优先）')
+    parser.add_argument('input', help="每行一个 cubestring 的文件，'-' 为标准输入")
+    parser.add_argument('--table', help='浅层解表文件；不给则全部交给 kociemba')
+    parser.add_argument('--out', default='-', help="输出 CSV 路径，默认 '-' 为标准输出")
+    args = parser.parse_args(argv)
+
+    table = ShallowTable(args.table) if args.table else None
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    dst = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8', newline='')
+    hits = total = 0
+    try:
+        writer = csv.DictWriter(dst, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in solve_all(read_cubestrings(src), table):
+            writer.writerow(row)
+            total += 1
+            hits += row['source'] == 'table'
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+        if table is not None:
+            table.close()
+    print(f'共 {total} 个，浅层表命中 {hits} 个', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
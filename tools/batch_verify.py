@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量验证 (cubestring, solution)：所有行放进 (n, 54) 的 uint8 数组，按步号同步推进，
+每一步按转动分组、用预计算的 54 格置换表做整列 NumPy gather，不再逐行逐步重放。
+
+  python tools/batch_verify.py solutions.csv [--chunk-size 100000] [--json stats.json]
+                              [--failures failures.csv]
+
+输入 CSV 需包含 cubestring、solution 两列（tools/batch_solve.py 的输出即可），按块流式读取。
+src/utils/solutionVerification.ts 是同一接口的 TS 版本。
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    print('请先安装 numpy: pip install numpy', file=sys.stderr)
+    sys.exit(1)
+
+import cube_facelets as cf
+
+# 把短解补齐到同一步数的占位转动，推进时跳过
+PAD_MOVE = len(cf.MOVES)
+MOVE_PERMUTATIONS = np.array(cf.MOVE_SOURCES, dtype=np.intp)
+SOLVED_CODES = np.repeat(np.arange(6, dtype=np.uint8), 9)
+FACE_LUT = np.full(256, 255, dtype=np.uint8)
+for _f, _c in enumerate(cf.FACES):
+    FACE_LUT[ord(_c)] = _f
+
+
+def encode_cubestrings(cubestrings):
+    """返回 ((n, 54) 面序号数组, 合法行掩码)"""
+    n = len(cubestrings)
+    states = np.zeros((n, 54), dtype=np.uint8)
+    valid = np.zeros(n, dtype=bool)
+    rows = [i for i, s in enumerate(cubestrings) if len(s) == 54 and s.isascii()]
+    if rows:
+        raw = np.frombuffer(''.join(cubestrings[i] for i in rows).encode('ascii'), dtype=np.uint8)
+        codes = FACE_LUT[raw].reshape(len(rows), 54)
+        ok = (codes != 255).all(axis=1)
+        idx = np.asarray(rows)
+        states[idx[ok]] = codes[ok]
+        valid[idx[ok]] = True
+    return states, valid
+
+
+def encode_solutions(solutions):
+    """返回 ((n, 最大步数) 转动下标数组（PAD_MOVE 补齐）, 步数, 合法行掩码)"""
+    n = len(solutions)
+    lengths = np.zeros(n, dtype=np.int32)
+    valid = np.ones(n, dtype=bool)
+    flat = []
+    lookup = cf.MOVE_INDEX.__getitem__
+    for i, solution in enumerate(solutions):
+        tokens = solution.split()
+        try:
+            indexes = list(map(lookup, tokens))
+        except KeyError:
+            valid[i] = False
+            continue
+        flat.extend(indexes)
+        lengths[i] = len(indexes)
+    # 一次性散射到 (行, 步号)，避免逐行切片赋值
+    moves = np.full((n, int(lengths.max(initial=0))), PAD_MOVE, dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.arange(len(flat)) - np.repeat(starts, lengths)
+    moves[rows, cols] = flat
+    return moves, lengths, valid
+
+
+def apply_move_column(states, column):
+    """原地把第 i 行推进一步 column[i]：按转动分组，每组一次整列置换，PAD_MOVE 组（已走完的行）不动"""
+    order = np.argsort(column, kind='stable')
+    counts = np.bincount(column, minlength=PAD_MOVE + 1)
+    start = 0
+    for m in range(PAD_MOVE):
+        rows = order[start:start + counts[m]]
+        if len(rows):
+            states[rows] = states[rows][:, MOVE_PERMUTATIONS[m]]
+        start += counts[m]
+
+
+def verify_batch(cubestrings, solutions):
+    """
+    验证一批 solutions[i] 是否还原 cubestrings[i]。
+    返回 (passed 布尔数组, 步数数组, 合法行掩码)；不合法行 passed 为 False。
+    """
+    if len(cubestrings) != len(solutions):
+        raise ValueError(f'cubestrings 与 solutions 行数不一致：{len(cubestrings)} vs {len(solutions)}')
+    states, state_ok = encode_cubestrings([s.strip() for s in cubestrings])
+    moves, lengths, solution_ok = encode_solutions(solutions)
+    valid = state_ok & solution_ok
+    for t in range(moves.shape[1]):
+        apply_move_column(states, moves[:, t])
+    passed = valid & (states == SOLVED_CODES).all(axis=1)
+    lengths[~valid] = 0
+    return passed, lengths, valid
+
+
+class VerificationStats:
+    """跨块累计的通过/失败数与解长度直方图（长度只计通过的行）"""
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.invalid = 0
+        self.histogram = np.zeros(0, dtype=np.int64)
+
+    def add(self, passed, lengths, valid):
+        self.total += len(passed)
+        self.passed += int(passed.sum())
+        self.invalid += int((~valid).sum())
+        counts = np.bincount(lengths[passed], minlength=len(self.histogram))
+        if len(counts) > len(self.histogram):
+            self.histogram = np.pad(self.histogram, (0, len(counts) - len(self.histogram)))
+        self.histogram[:len(counts)] += counts
+
+    def summary(self):
+        lengths = np.nonzero(self.histogram)[0]
+        mean = float((np.arange(len(self.histogram)) * self.histogram).sum() / self.passed) \
+            if self.passed else 0.0
+        return {
+            'total': self.total,
+            'passed': self.passed,
+            'failed': self.total - self.passed,
+            'invalid': self.invalid,
+            'min_length': int(lengths.min()) if len(lengths) else 0,
+            'max_length': int(lengths.max()) if len(lengths) else 0,
+            'mean_length': round(mean, 3),
+            'length_histogram': {int(k): int(self.histogram[k]) for k in lengths},
+        }
+
+
+def read_chunks(path, chunk_size):
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            ci, si = header.index('cubestring'), header.index('solution')
+        except ValueError:
+            raise SystemExit(f'{path} 缺少 cubestring / solution 列')
+        cubestrings, solutions = [], []
+        for row in reader:
+            cubestrings.append(row[ci])
+            solutions.append(row[si])
+            if len(cubestrings) >= chunk_size:
+                yield cubestrings, solutions
+                cubestrings, solutions = [], []
+        if cubestrings:
+            yield cubestrings, solutions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量验证解法是否还原 cubestring')
+    parser.add_argument('input', help='含 cubestring、solution 列的 CSV')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='每块行数（默认 100000）')
+    parser.add_argument('--json', help='把统计写入 JSON 文件')
+    parser.add_argument('--failures', help='把未通过的行写入 CSV')
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    stats = VerificationStats()
+    failures = open(args.failures, 'w', encoding='utf-8', newline='') if args.failures else None
+    try:
+        writer = csv.writer(failures) if failures else None
+        if writer:
+            writer.writerow(('cubestring', 'solution', 'reason'))
+        for cubestrings, solutions in read_chunks(args.input, args.chunk_size):
+            passed, lengths, valid = verify_batch(cubestrings, solutions)
+            stats.add(passed, lengths, valid)
+            if writer:
+                for i in np.nonzero(~passed)[0]:
+                    writer.writerow((cubestrings[i], solutions[i],
+                                     'not_solved' if valid[i] else 'invalid'))
+    finally:
+        if failures:
+            failures.close()
+
+    summary = stats.summary()
+    summary['seconds'] = round(time.perf_counter() - t0, 3)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
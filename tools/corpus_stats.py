@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统计一批 (cubestring, solution) 语料：解长度分布、分阶段长度、按深度分桶的耗时分位数与离群行。
+按块流式读取，内存只与块大小和直方图桶数有关，与总行数无关。
+
+  python tools/corpus_stats.py solutions.csv [thistlethwaite=tw.csv ...] [--chunk-size 100000]
+                               [--depth-bucket 1] [--top 20] [--json stats.json] [--csv-dir out/]
+
+输入 CSV 需包含 cubestring、solution 列（tools/batch_solve.py 的输出即可），可选列：
+- source：分组标签（batch_solve 写 table / kociemba / error）；写成 label=path 时整文件用 label
+- ms：单条求解耗时，用于耗时分位数与最慢行
+- depth：状态深度（如生成语料时的打乱步数）；缺省时用解长度代替
+
+分阶段长度不依赖求解器输出阶段标记：逐步重放解法（与 tools/batch_verify.py 同一套 NumPy 置换），
+记录首次进入各嵌套子群的步号——
+  eo：棱块朝向全对（<U, D, R, L, F2, B2>）
+  domino：再加角块朝向与 E 层棱归层，即 Kociemba 的 G1（<U, D, R2, L2, F2, B2>）
+  half_turn：半转群（<U2, D2, R2, L2, F2, B2>）
+kociemba 按 domino 切成两阶段，thistlethwaite 按 eo / domino / half_turn 切成四阶段
+（与 src/utils/thistlethwaite.ts 的 G1..G3 一致）。首次进入不一定是求解器自己的阶段边界，
+但对同一批解是同一把尺子。
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    print('请先安装 numpy: pip install numpy', file=sys.stderr)
+    sys.exit(1)
+
+import cube_facelets as cf
+from batch_verify import SOLVED_CODES, apply_move_column, encode_cubestrings, encode_solutions
+
+# 分阶段的求解器：标签前缀 -> 各阶段终点（最后一阶段终点恒为解长度）
+PHASED_SOLVERS = {
+    'kociemba': ('domino',),
+    'thistlethwaite': ('eo', 'domino', 'half_turn'),
+}
+MILESTONES = ('eo', 'domino', 'half_turn')
+
+# 耗时直方图：对数分桶，1 µs ~ 1000 s，每十倍 40 桶（相对误差约 3%）
+LATENCY_MIN_MS = 1e-3
+LATENCY_DECADES = 9
+LATENCY_BINS_PER_DECADE = 40
+LATENCY_BINS = LATENCY_DECADES * LATENCY_BINS_PER_DECADE
+
+_CORNERS = np.array(cf.CORNER_FACELETS, dtype=np.intp)
+_EDGES = np.array(cf.EDGE_FACELETS, dtype=np.intp)
+_FACELET_AXIS = np.repeat(np.arange(6, dtype=np.uint8), 9) % 3
+_EDGE_PAIRS = [(i, j) for i in range(12) for j in range(i + 1, 12)]
+# 朝向为 0 的角块 / 棱块：颜色编码 -> 块序号
+_CORNER_LUT = np.full(216, -1, dtype=np.int64)
+for _k, (_a, _b, _c) in enumerate(cf.CORNER_COLORS):
+    _CORNER_LUT[_a * 36 + _b * 6 + _c] = _k
+_EDGE_LUT = np.full(36, -1, dtype=np.int64)
+for _k, (_a, _b) in enumerate(cf.EDGE_COLORS):
+    _EDGE_LUT[_a * 6 + _b] = _k
+
+
+def _corner_code(corner_ids):
+    return (corner_ids * 8 ** np.arange(8, dtype=np.int64)).sum(axis=-1)
+
+
+def _half_turn_corner_codes():
+    """半转群中角块排列只有 96 种：从复原态按 6 个半转 BFS 得到"""
+    half_turns = [m for m in cf.MOVES if m.endswith('2')]
+    key = lambda s: tuple(s[i] for f in cf.CORNER_FACELETS for i in f)
+    seen = {key(cf.SOLVED): cf.SOLVED}
+    frontier = deque([cf.SOLVED])
+    while frontier:
+        state = frontier.popleft()
+        for move in half_turns:
+            nxt = cf.apply_move(state, move)
+            if key(nxt) not in seen:
+                seen[key(nxt)] = nxt
+                frontier.append(nxt)
+    codes, _ = encode_cubestrings(list(seen.values()))
+    c = codes[:, _CORNERS].astype(np.int64)
+    return np.sort(_corner_code(_CORNER_LUT[c[..., 0] * 36 + c[..., 1] * 6 + c[..., 2]]))
+
+
+HALF_TURN_CORNER_CODES = _half_turn_corner_codes()
+
+
+def milestone_masks(states):
+    """(n, 54) 面序号数组 -> {里程碑: 布尔数组}，各子群逐级嵌套"""
+    is_ud = (states == 0) | (states == 3)
+    is_fb = (states == 2) | (states == 5)
+    edge_has_ud = is_ud[:, _EDGES].any(axis=2)
+    primary = _EDGES[:, 0]
+    eo = np.where(edge_has_ud, is_ud[:, primary], is_fb[:, primary]).all(axis=1)
+    domino = eo & is_ud[:, _CORNERS[:, 0]].all(axis=1) & edge_has_ud[:, :8].all(axis=1)
+
+    # 半转群：每个贴纸都是本面或对面颜色、角块排列在 96 种之内、棱块排列为偶排列
+    half_turn = np.zeros(len(states), dtype=bool)
+    rows = np.nonzero(domino & (states % 3 == _FACELET_AXIS).all(axis=1))[0]
+    if len(rows):
+        sub = states[rows].astype(np.int64)
+        c = sub[:, _CORNERS]
+        corner_ok = np.isin(_corner_code(_CORNER_LUT[c[..., 0] * 36 + c[..., 1] * 6 + c[..., 2]]),
+                            HALF_TURN_CORNER_CODES)
+        e = sub[:, _EDGES]
+        edges = _EDGE_LUT[e[..., 0] * 6 + e[..., 1]]
+        inversions = sum((edges[:, i] > edges[:, j]).astype(np.int8) for i, j in _EDGE_PAIRS)
+        half_turn[rows] = corner_ok & (inversions % 2 == 0)
+    return {'eo': eo, 'domino': domino, 'half_turn': half_turn}
+
+
+def replay_chunk(cubestrings, solutions):
+    """
+    重放一块解法。返回 (solved, lengths, valid, first_reach)：
+    first_reach[name] 为首次进入该子群的步号（从未进入为 -1）。
+    """
+    states, state_ok = encode_cubestrings([s.strip() for s in cubestrings])
+    moves, lengths, solution_ok = encode_solutions(solutions)
+    valid = state_ok & solution_ok
+    first_reach = {name: np.full(len(states), -1, dtype=np.int32) for name in MILESTONES}
+
+    def mark(step):
+        # 只检查还没进入最内层子群的行
+        pending = np.nonzero(first_reach[MILESTONES[-1]] < 0)[0]
+        if not len(pending):
+            return
+        for name, mask in milestone_masks(states[pending]).items():
+            reach = first_reach[name]
+            rows = pending[mask]
+            reach[rows[reach[rows] < 0]] = step
+
+    mark(0)
+    for t in range(moves.shape[1]):
+        apply_move_column(states, moves[:, t])
+        mark(t + 1)
+    solved = valid & (states == SOLVED_CODES).all(axis=1)
+    lengths[~valid] = 0
+    return solved, lengths, valid, first_reach
+
+
+class CountHistogram:
+    """非负整数计数直方图，按需扩容"""
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, values):
+        counts = np.bincount(values, minlength=len(self.counts))
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+        self.counts[:len(counts)] += counts
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        cumulative = np.cumsum(self.counts)
+        return int(np.searchsorted(cumulative, q * cumulative[-1])) if self.total else 0
+
+    def summary(self):
+        total = self.total
+        nonzero = np.nonzero(self.counts)[0]
+        mean = float((np.arange(len(self.counts)) * self.counts).sum() / total) if total else 0.0
+        return {
+            'count': total,
+            'min': int(nonzero.min()) if total else 0,
+            'max': int(nonzero.max()) if total else 0,
+            'mean': round(mean, 3),
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'histogram': {int(k): int(self.counts[k]) for k in nonzero},
+        }
+
+
+class LatencyHistogram:
+    """固定对数分桶的耗时直方图：分位数取桶的几何中点，精确记录 min / max / 总和"""
+
+    def __init__(self):
+        self.counts = np.zeros(LATENCY_BINS, dtype=np.int64)
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        if not len(ms):
+            return
+        scaled = np.log10(np.maximum(ms, LATENCY_MIN_MS) / LATENCY_MIN_MS) * LATENCY_BINS_PER_DECADE
+        bins = np.minimum(scaled.astype(np.int64), LATENCY_BINS - 1)
+        self.counts += np.bincount(bins, minlength=LATENCY_BINS)
+        self.total_ms += float(ms.sum())
+        self.min_ms = min(self.min_ms, float(ms.min()))
+        self.max_ms = max(self.max_ms, float(ms.max()))
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        cumulative = np.cumsum(self.counts)
+        b = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        center = LATENCY_MIN_MS * 10 ** ((b + 0.5) / LATENCY_BINS_PER_DECADE)
+        return min(max(center, self.min_ms), self.max_ms)
+
+    def summary(self):
+        count = self.count
+        return {
+            'count': count,
+            'mean_ms': round(self.total_ms / count, 3),
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p90_ms': round(self.quantile(0.9), 3),
+            'p99_ms': round(self.quantile(0.99), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+class TopRows:
+    """按某一数值保留最大的 k 行（小根堆）"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.seq = 0
+
+    def add(self, values, rows):
+        """values 为本块数值数组，rows(i) 返回第 i 行的记录；只对块内前 k 名建记录"""
+        if self.k <= 0 or not len(values):
+            return
+        top = np.argpartition(values, -self.k)[-self.k:] if len(values) > self.k else range(len(values))
+        for i in top:
+            item = (float(values[i]), self.seq, rows(i))
+            self.seq += 1
+            if len(self.heap) < self.k:
+                heapq.heappush(self.heap, item)
+            elif item > self.heap[0]:
+                heapq.heapreplace(self.heap, item)
+
+    def rows(self):
+        return [row for _, _, row in sorted(self.heap, reverse=True)]
+
+
+class LabelStats:
+    """单个分组（求解器 / 来源）的累计统计"""
+
+    def __init__(self, label, depth_bucket, top):
+        self.label = label
+        self.depth_bucket = depth_bucket
+        self.phase_ends = next(
+            (ends for prefix, ends in PHASED_SOLVERS.items() if label.lower().startswith(prefix)), None)
+        self.rows = 0
+        self.invalid = 0
+        self.not_solved = 0
+        self.lengths = CountHistogram()
+        self.phases = [CountHistogram() for _ in range(len(self.phase_ends) + 1)] if self.phase_ends else []
+        self.latency = {}
+        self.slowest = TopRows(top)
+        self.longest = TopRows(top)
+        self.failures = []
+        self.top = top
+
+    def add(self, cubestrings, solutions, ms, depth, solved, lengths, valid, first_reach):
+        self.rows += len(cubestrings)
+        self.invalid += int((~valid).sum())
+        self.not_solved += int((valid & ~solved).sum())
+        for i in np.nonzero(~solved)[0][:self.top - len(self.failures)]:
+            self.failures.append(self._row(cubestrings, solutions, ms, lengths, i,
+                                           'not_solved' if valid[i] else 'invalid'))
+
+        ok = np.nonzero(solved)[0]
+        self.lengths.add(lengths[ok])
+        if self.phase_ends:
+            start = np.zeros(len(ok), dtype=np.int64)
+            for k, name in enumerate(self.phase_ends):
+                end = first_reach[name][ok].astype(np.int64)
+                self.phases[k].add(end - start)
+                start = end
+            self.phases[-1].add(lengths[ok] - start)
+
+        self.longest.add(lengths[ok], lambda j: self._row(cubestrings, solutions, ms, lengths, ok[j], 'longest'))
+        if ms is not None:
+            timed = ok[~np.isnan(ms[ok])]
+            buckets = (depth[timed] if depth is not None else lengths[timed]) // self.depth_bucket
+            for b in np.unique(buckets):
+                self.latency.setdefault(int(b), LatencyHistogram()).add(ms[timed[buckets == b]])
+            self.slowest.add(ms[timed], lambda j: self._row(cubestrings, solutions, ms, lengths, timed[j], 'slowest'))
+
+    @staticmethod
+    def _row(cubestrings, solutions, ms, lengths, i, kind):
+        return {
+            'kind': kind,
+            'cubestring': cubestrings[i],
+            'solution': solutions[i],
+            'length': int(lengths[i]),
+            'ms': None if ms is None or np.isnan(ms[i]) else round(float(ms[i]), 3),
+        }
+
+    def latency_rows(self):
+        for b in sorted(self.latency):
+            yield {
+                'depth_from': b * self.depth_bucket,
+                'depth_to': (b + 1) * self.depth_bucket - 1,
+                **self.latency[b].summary(),
+            }
+
+    def outliers(self):
+        return {'slowest': self.slowest.rows(), 'longest': self.longest.rows(), 'failures': self.failures}
+
+    def summary(self):
+        out = {
+            'rows': self.rows,
+            'solved': self.rows - self.invalid - self.not_solved,
+            'not_solved': self.not_solved,
+            'invalid': self.invalid,
+            'length': self.lengths.summary(),
+        }
+        if self.phase_ends:
+            out['phases'] = {f'phase{k + 1}': h.summary() for k, h in enumerate(self.phases)}
+        if self.latency:
+            out['latency_by_depth'] = list(self.latency_rows())
+        out['outliers'] = self.outliers()
+        return out
+
+
+def read_chunks(path, chunk_size):
+    """按块产出 {列名: 字符串列表}；缺少的可选列不出现在字典里"""
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if 'cubestring' not in header or 'solution' not in header:
+            raise SystemExit(f'{path} 缺少 cubestring / solution 列')
+        wanted = [name for name in ('cubestring', 'solution', 'source', 'ms', 'depth') if name in header]
+        index = [header.index(name) for name in wanted]
+        columns = [[] for _ in wanted]
+        for row in reader:
+            for column, i in zip(columns, index):
+                column.append(row[i] if i < len(row) else '')
+            if len(columns[0]) >= chunk_size:
+                yield dict(zip(wanted, columns))
+                columns = [[] for _ in wanted]
+        if columns[0]:
+            yield dict(zip(wanted, columns))
+
+
+def _float_column(values):
+    out = np.full(len(values), np.nan, dtype=np.float64)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v)
+        except ValueError:
+            pass
+    return out
+
+
+class CorpusStats:
+    def __init__(self, depth_bucket=1, top=20):
+        self.depth_bucket = depth_bucket
+        self.top = top
+        self.labels = {}
+
+    def add_chunk(self, chunk, label=None):
+        cubestrings, solutions = chunk['cubestring'], chunk['solution']
+        solved, lengths, valid, first_reach = replay_chunk(cubestrings, solutions)
+        ms = _float_column(chunk['ms']) if 'ms' in chunk else None
+        depth = None
+        if 'depth' in chunk:
+            depth = np.array([int(d) if d.strip().isdigit() else -1 for d in chunk['depth']], dtype=np.int64)
+            depth = np.where(depth >= 0, depth, lengths)
+
+        if label is not None:
+            groups = {label: np.arange(len(cubestrings))}
+        elif 'source' in chunk:
+            sources = np.array(chunk['source'], dtype=object)
+            groups = {str(s): np.nonzero(sources == s)[0] for s in dict.fromkeys(chunk['source'])}
+        else:
+            groups = {'all': np.arange(len(cubestrings))}
+
+        for name, rows in groups.items():
+            stats = self.labels.get(name)
+            if stats is None:
+                stats = self.labels[name] = LabelStats(name, self.depth_bucket, self.top)
+            stats.add(
+                [cubestrings[i] for i in rows],
+                [solutions[i] for i in rows],
+                ms[rows] if ms is not None else None,
+                depth[rows] if depth is not None else None,
+                solved[rows], lengths[rows], valid[rows],
+                {k: v[rows] for k, v in first_reach.items()},
+            )
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.labels.items()}
+
+    def write_csv(self, directory):
+        """lengths.csv / phases.csv / latency.csv / outliers.csv"""
+        os.makedirs(directory, exist_ok=True)
+
+        def open_writer(name, header):
+            f = open(os.path.join(directory, name), 'w', encoding='utf-8', newline='')
+            writer = csv.writer(f)
+            writer.writerow(header)
+            return f, writer
+
+        latency_fields = ('depth_from', 'depth_to', 'count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')
+        outlier_fields = ('kind', 'cubestring', 'solution', 'length', 'ms')
+        files = []
+        try:
+            files.append(open_writer('lengths.csv', ('label', 'length', 'count')))
+            files.append(open_writer('phases.csv', ('label', 'phase', 'length', 'count')))
+            files.append(open_writer('latency.csv', ('label',) + latency_fields))
+            files.append(open_writer('outliers.csv', ('label',) + outlier_fields))
+            (_, lengths), (_, phases), (_, latency), (_, outliers) = files
+            for name, stats in self.labels.items():
+                for length in np.nonzero(stats.lengths.counts)[0]:
+                    lengths.writerow((name, int(length), int(stats.lengths.counts[length])))
+                for k, hist in enumerate(stats.phases):
+                    for length in np.nonzero(hist.counts)[0]:
+                        phases.writerow((name, f'phase{k + 1}', int(length), int(hist.counts[length])))
+                for row in stats.latency_rows():
+                    latency.writerow((name,) + tuple(row[field] for field in latency_fields))
+                for rows in stats.outliers().values():
+                    for row in rows:
+                        outliers.writerow((name,) + tuple('' if row[f] is None else row[f] for f in outlier_fields))
+        finally:
+            for f, _ in files:
+                f.close()
+
+
+def parse_input(spec):
+    """'label=path' 或 'path'"""
+    label, sep, path = spec.partition('=')
+    return (label, path) if sep and not os.path.exists(spec) else (None, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='统计解法语料的长度、分阶段长度与耗时分布')
+    parser.add_argument('inputs', nargs='+', help='含 cubestring、solution 列的 CSV；label=path 为整文件指定分组')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='每块行数（默认 100000）')
+    parser.add_argument('--depth-bucket', type=int, default=1, help='耗时统计的深度桶宽（默认 1）')
+    parser.add_argument('--top', type=int, default=20, help='每组保留的最慢 / 最长 / 失败行数（默认 20）')
+    parser.add_argument('--json', help='把统计写入 JSON 文件')
+    parser.add_argument('--csv-dir', help='把 lengths / phases / latency / outliers 写成 CSV 到该目录')
+    args = parser.parse_args(argv)
+    if args.depth_bucket < 1:
+        parser.error('--depth-bucket 必须 >= 1')
+
+    t0 = time.perf_counter()
+    stats = CorpusStats(depth_bucket=args.depth_bucket, top=args.top)
+    for spec in args.inputs:
+        label, path = parse_input(spec)
+        for chunk in read_chunks(path, args.chunk_size):
+            stats.add_chunk(chunk, label)
+
+    summary = {'labels': stats.summary(), 'seconds': round(time.perf_counter() - t0, 3)}
+    summary_text = json.dumps(summary, ensure_ascii=False, indent=2)
+    print(summary_text)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(summary_text)
+    if args.csv_dir:
+        stats.write_csv(args.csv_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
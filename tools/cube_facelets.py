@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kociemba cubestring（54 字符，面顺序 U R F D L B，每面行优先）的贴纸级魔方模型。
+
+与 src/utils/cubieBasedCubeLogic.ts 使用同一套坐标与转动方向：
+- 贴纸 = (cubie 坐标, 贴纸法向)，坐标取值 -1/0/1
+- R: (x, y, z) -> (x, z, -y)    L: (x, y, z) -> (x, -z, y)
+- U: (x, y, z) -> (-z, y, x)    D: (x, y, z) -> (z, y, -x)
+- F: (x, y, z) -> (y, -x, z)    B: (x, y, z) -> (-y, x, z)
+
+转动与整体对称都表示为「来源下标」置换：new[i] = old[src[i]]。
+"""
+
+from itertools import permutations, product
+from operator import itemgetter
+
+FACES = 'URFDLB'
+SOLVED = ''.join(face * 9 for face in FACES)
+CENTER_INDEXES = (4, 13, 22, 31, 40, 49)
+
+# 角块 / 棱块槽位的贴纸下标（Kociemba 槽位顺序）。首个贴纸在 U/D 面（E 层棱在 F/B 面），
+# 朝向为 0 的块正是该贴纸为 U/D（E 层棱为 F/B）颜色
+CORNER_FACELETS = (
+    (8, 9, 20), (6, 18, 38), (0, 36, 47), (2, 45, 11),      # URF UFL ULB UBR
+    (29, 26, 15), (27, 44, 24), (33, 53, 42), (35, 17, 51),  # DFR DLF DBL DRB
+)
+EDGE_FACELETS = (
+    (5, 10), (7, 19), (3, 37), (1, 46),      # UR UF UL UB
+    (32, 16), (28, 25), (30, 43), (34, 52),  # DR DF DL DB
+    (23, 12), (21, 41), (50, 39), (48, 14),  # FR FL BL BR
+)
+# 复原状态下各槽位贴纸的面序号（FACES 下标），即每个角块 / 棱块的颜色
+CORNER_COLORS = tuple(tuple(FACES.index(SOLVED[i]) for i in f) for f in CORNER_FACELETS)
+EDGE_COLORS = tuple(tuple(FACES.index(SOLVED[i]) for i in f) for f in EDGE_FACELETS)
+
+# 与 cubeSolver.ts 中 allMoves 顺序一致：面序 R L U D F B，每面 [X, X', X2]
+MOVES = tuple(
+    face + suffix for face in 'RLUDFB' for suffix in ('', "'", '2')
+)
+MOVE_INDEX = {move: i for i, move in enumerate(MOVES)}
+
+_FACE_NORMALS = {
+    'U': (0, 1, 0),
+    'R': (1, 0, 0),
+    'F': (0, 0, 1),
+    'D': (0, -1, 0),
+    'L': (-1, 0, 0),
+    'B': (0, 0, -1),
+}
+
+# 各面 (row, col) -> cubie 坐标，与 cubeConverter.cubeStateToCubestring 的注释一致
+_FACE_POSITION = {
+    'U': lambda r, c: (c - 1, 1, r - 1),
+    'R': lambda r, c: (1, 1 - r, 1 - c),
+    'F': lambda r, c: (c - 1, 1 - r, 1),
+    'D': lambda r, c: (c - 1, -1, 1 - r),
+    'L': lambda r, c: (-1, 1 - r, c - 1),
+    'B': lambda r, c: (1 - c, 1 - r, -1),
+}
+
+_MOVE_GEOMETRY = {
+    'R': (0, 1, lambda x, y, z: (x, z, -y)),
+    'L': (0, -1, lambda x, y, z: (x, -z, y)),
+    'U': (1, 1, lambda x, y, z: (-z, y, x)),
+    'D': (1, -1, lambda x, y, z: (z, y, -x)),
+    'F': (2, 1, lambda x, y, z: (y, -x, z)),
+    'B': (2, -1, lambda x, y, z: (-y, x, z)),
+}
+
+FACELETS = tuple(
+    (_FACE_POSITION[face](row, col), _FACE_NORMALS[face])
+    for face in FACES
+    for row in range(3)
+    for col in range(3)
+)
+_FACELET_INDEX = {facelet: i for i, facelet in enumerate(FACELETS)}
+
+
+def _compose(first, then):
+    """先施加 first 再施加 then 的来源置换"""
+    return tuple(first[then[i]] for i in range(54))
+
+
+def _quarter_turn_src(face):
+    axis, value, rotate = _MOVE_GEOMETRY[face]
+    src = list(range(54))
+    for i, (pos, normal) in enumerate(FACELETS):
+        if pos[axis] != value:
+            continue
+        j = _FACELET_INDEX[(rotate(*pos), rotate(*normal))]
+        src[j] = i
+    return tuple(src)
+
+
+def _build_move_sources():
+    sources = []
+    for face in 'RLUDFB':
+        quarter = _quarter_turn_src(face)
+        half = _compose(quarter, quarter)
+        sources.extend([quarter, _compose(half, quarter), half])
+    return tuple(sources)
+
+
+MOVE_SOURCES = _build_move_sources()
+_MOVE_GETTERS = tuple(itemgetter(*src) for src in MOVE_SOURCES)
+
+
+def apply_move(state, move):
+    """state 为 54 字符 str 或 bytes；move 为 MOVES 中的名称或下标"""
+    index = move if isinstance(move, int) else MOVE_INDEX[move]
+    moved = _MOVE_GETTERS[index](state)
+    return bytes(moved) if isinstance(state, bytes) else ''.join(moved)
+
+
+def apply_moves(state, moves):
+    for move in moves:
+        state = apply_move(state, move)
+    return state
+
+
+def parse_moves(solution):
+    return [move for move in solution.split() if move]
+
+
+def inverse_move_index(index):
+    kind = index % 3
+    return index if kind == 2 else index - kind + (1 - kind)
+
+
+def _matrices():
+    for perm in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            yield tuple(
+                tuple(signs[r] if c == perm[r] else 0 for c in range(3))
+                for r in range(3)
+            )
+
+
+def _mul(matrix, vector):
+    return tuple(sum(matrix[r][c] * vector[c] for c in range(3)) for r in range(3))
+
+
+class Symmetry:
+    """
+    整体对称（24 个旋转 + 24 个镜像）。transform(state) 把状态连同颜色一起映射到等价状态；
+    move_forward[m]：若 m 作用于 state，则 move_forward[m] 作用于 transform(state)。
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        src = [0] * 54
+        for i, (pos, normal) in enumerate(FACELETS):
+            src[_FACELET_INDEX[(_mul(matrix, pos), _mul(matrix, normal))]] = i
+        self.src = tuple(src)
+        normal_to_face = {normal: face for face, normal in _FACE_NORMALS.items()}
+        self.color_map = {
+            face: normal_to_face[_mul(matrix, normal)]
+            for face, normal in _FACE_NORMALS.items()
+        }
+        self._getter = itemgetter(*self.src)
+        self._table = bytes.maketrans(
+            ''.join(self.color_map).encode(), ''.join(self.color_map.values()).encode()
+        )
+        self.move_forward = None
+        self.move_back = None
+
+    def transform(self, state):
+        if isinstance(state, bytes):
+            return bytes(self._getter(state)).translate(self._table)
+        return bytes(self._getter(state.encode())).translate(self._table).decode()
+
+
+def _probe_state():
+    # 用一个无对称性的确定性打乱推导转动映射
+    return apply_moves(SOLVED, ['R', "U'", 'F2', 'D', 'L', "B'", 'R2', 'U', "F'", 'L2'])
+
+
+def _build_symmetries():
+    probe = _probe_state()
+    symmetries = []
+    for matrix in _matrices():
+        sym = Symmetry(matrix)
+        forward = []
+        for m in range(len(MOVES)):
+            target = sym.transform(apply_move(probe, m))
+            base = sym.transform(probe)
+            matches = [n for n in range(len(MOVES)) if apply_move(base, n) == target]
+            if len(matches) != 1:
+                raise RuntimeError('整体对称与转动映射不唯一，贴纸模型有误')
+            forward.append(matches[0])
+        sym.move_forward = tuple(forward)
+        back = [0] * len(MOVES)
+        for m, n in enumerate(forward):
+            back[n] = m
+        sym.move_back = tuple(back)
+        symmetries.append(sym)
+    return tuple(symmetries)
+
+
+SYMMETRIES = _build_symmetries()
+
+
+def canonicalize(state):
+    """
+    返回 (代表元, 对称下标)：代表元为 48 个对称像中字典序最小者（bytes 输入则返回 bytes）。
+    """
+    best = None
+    best_index = 0
+    for k, sym in enumerate(SYMMETRIES):
+        image = sym.transform(state)
+        if best is None or image < best:
+            best = image
+            best_index = k
+    return best, best_index
+
+
+def pack_state(state):
+    """
+    48 个非中心贴纸按 FACES 序号各占 3 位打包为 18 字节（小端位序）。
+    中心在合法 cubestring 中恒为 URFDLB，不参与编码。
+    """
+    if isinstance(state, bytes):
+        state = state.decode()
+    value = 0
+    shift = 0
+    for i, face in enumerate(state):
+        if i in CENTER_INDEXES:
+            continue
+        value |= FACES.index(face) << shift
+        shift += 3
+    return value.to_bytes(18, 'little')
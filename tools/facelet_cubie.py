@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cubestring → 块级状态（Kociemba 槽位顺序的角块 / 棱块排列与朝向），查表实现。
+
+每个槽位的贴纸下标固定（cube_facelets.CORNER_FACELETS / EDGE_FACELETS），
+槽位颜色编码成整数后查一次表即得 (块, 朝向)。接受 / 拒绝的规则与
+src/utils/faceColorsToCubieBased.ts 一致：中心为 URFDLB、每色 9 个、
+每个槽位的颜色集合是某个块且不重复；不检查扭转 / 翻转 / 奇偶（可还原性另行判断）。
+颜色集合对但手性相反的角块同样按集合接受，朝向记为 CORNER_MIRRORED。
+
+  python tools/facelet_cubie.py cubestrings.txt [--out cubies.csv] [--chunk-size 100000]
+
+输出 CSV 列：cubestring, cp, co, ep, eo, error（排列 / 朝向以空格分隔）
+"""
+
+import argparse
+import csv
+import sys
+from collections import namedtuple
+
+import cube_facelets as cf
+
+CORNER_MIRRORED = 3
+
+CubieState = namedtuple('CubieState', 'cp co ep eo')
+
+
+class FaceletError(ValueError):
+    pass
+
+
+def corner_color_key(a, b, c):
+    return a * 36 + b * 6 + c
+
+
+def edge_color_key(a, b):
+    return a * 6 + b
+
+
+def _build_corner_lookup():
+    """corner_color_key(槽位三个贴纸颜色) -> 块 * 4 + 朝向（0..2 或 CORNER_MIRRORED），无效为 -1"""
+    table = [-1] * 216
+    for piece, colors in enumerate(cf.CORNER_COLORS):
+        for o in range(3):
+            seen = [0] * 3
+            mirrored = [0] * 3
+            for k in range(3):
+                seen[(k + o) % 3] = colors[k]
+                mirrored[(-k - o) % 3] = colors[k]
+            table[corner_color_key(*seen)] = piece * 4 + o
+            table[corner_color_key(*mirrored)] = piece * 4 + CORNER_MIRRORED
+    return tuple(table)
+
+
+def _build_edge_lookup():
+    """edge_color_key(槽位两个贴纸颜色) -> 块 * 2 + 朝向，无效为 -1"""
+    table = [-1] * 36
+    for piece, (a, b) in enumerate(cf.EDGE_COLORS):
+        table[edge_color_key(a, b)] = piece * 2
+        table[edge_color_key(b, a)] = piece * 2 + 1
+    return tuple(table)
+
+
+CORNER_LOOKUP = _build_corner_lookup()
+EDGE_LOOKUP = _build_edge_lookup()
+CORNER_NAMES = ('URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB')
+EDGE_NAMES = ('UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR')
+_FACE_CODE = {face: i for i, face in enumerate(cf.FACES)}
+
+
+def _slot_colors(cubestring, facelets):
+    return ''.join(cubestring[i] for i in facelets)
+
+
+def to_cubies(cubestring):
+    """单个 cubestring -> CubieState；不合法时抛出 FaceletError"""
+    s = cubestring.strip()
+    if len(s) != 54:
+        raise FaceletError(f'cubestring 长度应为 54，实际为 {len(s)}')
+    try:
+        codes = [_FACE_CODE[c] for c in s]
+    except KeyError as e:
+        raise FaceletError(f'非法颜色字符: {e.args[0]}') from None
+    for face, index in zip(cf.FACES, cf.CENTER_INDEXES):
+        if s[index] != face:
+            raise FaceletError(f'{face} 面中心应为 {face}，实际为 {s[index]}')
+    for face in cf.FACES:
+        count = s.count(face)
+        if count != 9:
+            raise FaceletError(f'颜色 {face} 应有 9 个，实际为 {count}')
+
+    cp, co, used = [], [], 0
+    for slot, (a, b, c) in enumerate(cf.CORNER_FACELETS):
+        entry = CORNER_LOOKUP[corner_color_key(codes[a], codes[b], codes[c])]
+        if entry < 0 or used >> (entry >> 2) & 1:
+            raise FaceletError(f'{CORNER_NAMES[slot]} 角块颜色无效: {_slot_colors(s, (a, b, c))}')
+        used |= 1 << (entry >> 2)
+        cp.append(entry >> 2)
+        co.append(entry & 3)
+
+    ep, eo, used = [], [], 0
+    for slot, (a, b) in enumerate(cf.EDGE_FACELETS):
+        entry = EDGE_LOOKUP[edge_color_key(codes[a], codes[b])]
+        if entry < 0 or used >> (entry >> 1) & 1:
+            raise FaceletError(f'{EDGE_NAMES[slot]} 棱块颜色无效: {_slot_colors(s, (a, b))}')
+        used |= 1 << (entry >> 1)
+        ep.append(entry >> 1)
+        eo.append(entry & 1)
+    return CubieState(tuple(cp), tuple(co), tuple(ep), tuple(eo))
+
+
+def to_cubies_batch(cubestrings):
+    """
+    批量转换（NumPy）。返回 (cp, co, ep, eo, ok)：前四个为 (n, 8) / (n, 12) 的 int8 数组，
+    ok 为合法行掩码（不合法行的其余数组内容无意义，需要错误原因时对该行调用 to_cubies）。
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        print('请先安装 numpy: pip install numpy', file=sys.stderr)
+        sys.exit(1)
+    from batch_verify import encode_cubestrings
+
+    codes, ok = encode_cubestrings([s.strip() for s in cubestrings])
+    codes = codes.astype(np.intp)
+    ok &= (codes[:, list(cf.CENTER_INDEXES)] == np.arange(6)).all(axis=1)
+    counts = np.stack([(codes == f).sum(axis=1) for f in range(6)], axis=1)
+    ok &= (counts == 9).all(axis=1)
+
+    c = codes[:, cf.CORNER_FACELETS]
+    corners = np.asarray(CORNER_LOOKUP, dtype=np.int8)[corner_color_key(c[..., 0], c[..., 1], c[..., 2])]
+    e = codes[:, cf.EDGE_FACELETS]
+    edges = np.asarray(EDGE_LOOKUP, dtype=np.int8)[edge_color_key(e[..., 0], e[..., 1])]
+    cp, ep = corners >> 2, edges >> 1
+    # 每类块恰好各出现一次（含 -1 的行排序后必然对不上）
+    ok &= (np.sort(cp, axis=1) == np.arange(8)).all(axis=1) & (corners >= 0).all(axis=1)
+    ok &= (np.sort(ep, axis=1) == np.arange(12)).all(axis=1) & (edges >= 0).all(axis=1)
+    return cp, corners & 3, ep, edges & 1, ok
+
+
+def read_chunks(stream, chunk_size):
+    chunk = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='cubestring 批量转换为角块 / 棱块排列与朝向')
+    parser.add_argument('input', help="每行一个 cubestring 的文件，'-' 为标准输入")
+    parser.add_argument('--out', help='输出 CSV（默认标准输出）')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='每块行数（默认 100000）')
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    out = open(args.out, 'w', encoding='utf-8', newline='') if args.out else sys.stdout
+    failed = 0
+    try:
+        writer = csv.writer(out)
+        writer.writerow(('cubestring', 'cp', 'co', 'ep', 'eo', 'error'))
+        join = lambda row: ' '.join(map(str, row))
+        for chunk in read_chunks(src, args.chunk_size):
+            cp, co, ep, eo, ok = to_cubies_batch(chunk)
+            for i, cubestring in enumerate(chunk):
+                if ok[i]:
+                    writer.writerow((cubestring, join(cp[i]), join(co[i]), join(ep[i]), join(eo[i]), ''))
+                    continue
+                failed += 1
+                try:
+                    to_cubies(cubestring)
+                    error = '未知错误'
+                except FaceletError as e:
+                    error = str(e)
+                writer.writerow((cubestring, '', '', '', '', error))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f'{failed} 行无法转换', file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
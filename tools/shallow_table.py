@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浅层状态最优解查表（默认深度 ≤ 7，HTM 计步）：离线生成、磁盘哈希索引、48 对称约化。
+
+生成：
+  python tools/shallow_table.py build --depth 7 --out shallow-table.bin [--workers 8]
+查询：
+  python tools/shallow_table.py lookup shallow-table.bin <cubestring>
+
+文件格式（小端）：
+  header  'CSHT' | u16 版本 | u8 最大深度 | u8 对称数 | u32 条目数 | u32 槽位数
+  对称表  每个对称：54 字节来源下标 src、6 字节颜色映射（URFDLB 序号）、18 字节 move_back
+  槽位    每槽：18 字节打包状态 | u8 解长度（0xFF = 空槽）| 最大深度个 u8 转动下标
+状态先取 48 个对称像中字典序最小的 cubestring 作为代表元，再按 pack_state 打包；
+槽位 = FNV-1a(打包状态) & (槽位数 - 1)，线性探测。存储的解还原代表元，
+查询时用对应对称的 move_back 映射回原状态。src/utils/shallowSolutionTable.ts 读取同一格式。
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+from multiprocessing import Pool
+
+import cube_facelets as cf
+
+MAGIC = b'CSHT'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBII')
+KEY_SIZE = 18
+EMPTY_SLOT = 0xFF
+DEFAULT_DEPTH = 7
+MAX_LOAD_FACTOR = 0.5
+_FACE_CHARS = frozenset(cf.FACES)
+
+
+def fnv1a32(data):
+    h = 0x811C9DC5
+    for byte in data:
+        h ^= byte
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def _expand_chunk(chunk):
+    """子进程：展开一批代表元，返回 (代表元, 还原代表元的解)"""
+    out = []
+    for state, solution in chunk:
+        last_face = cf.MOVES[solution[0]][0] if solution else ''
+        for m, move in enumerate(cf.MOVES):
+            # 同面连续两步可合并，跳过（与 IDA* 剪枝一致）
+            if move[0] == last_face:
+                continue
+            child = cf.apply_move(state, m)
+            canon, k = cf.canonicalize(child)
+            forward = cf.SYMMETRIES[k].move_forward
+            child_solution = (cf.inverse_move_index(m),) + solution
+            out.append((canon, tuple(forward[n] for n in child_solution)))
+    return out
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def build_entries(max_depth, workers=None, chunk_size=2000, log=print):
+    """
+    对称约化的逐层 BFS：每层的代表元分块交给进程池展开，主进程按代表元去重。
+    返回 {代表元 bytes: 解（转动下标元组）}。
+    """
+    solved = cf.SOLVED.encode()
+    entries = {solved: ()}
+    frontier = [(solved, ())]
+    with Pool(processes=workers) as pool:
+        for depth in range(1, max_depth + 1):
+            t0 = time.time()
+            next_frontier = []
+            for batch in pool.imap_unordered(_expand_chunk, _chunks(frontier, chunk_size)):
+                for canon, solution in batch:
+                    if canon in entries:
+                        continue
+                    entries[canon] = solution
+                    next_frontier.append((canon, solution))
+            frontier = next_frontier
+            log(f'深度 {depth}: 新增 {len(frontier)} 个代表元，累计 {len(entries)}，'
+                f'耗时 {time.time() - t0:.1f}s')
+            if not frontier:
+                break
+    return entries
+
+
+def write_table(path, entries, max_depth):
+    capacity = 1
+    while capacity * MAX_LOAD_FACTOR < len(entries):
+        capacity <<= 1
+    record_size = KEY_SIZE + 1 + max_depth
+    slots = bytearray(b'\x00' * (capacity * record_size))
+    for i in range(capacity):
+        slots[i * record_size + KEY_SIZE] = EMPTY_SLOT
+
+    for canon, solution in entries.items():
+        key = cf.pack_state(canon)
+        slot = fnv1a32(key) & (capacity - 1)
+        while slots[slot * record_size + KEY_SIZE] != EMPTY_SLOT:
+            slot = (slot + 1) & (capacity - 1)
+        offset = slot * record_size
+        slots[offset:offset + KEY_SIZE] = key
+        slots[offset + KEY_SIZE] = len(solution)
+        slots[offset + KEY_SIZE + 1:offset + KEY_SIZE + 1 + len(solution)] = bytes(solution)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_depth, len(cf.SYMMETRIES), len(entries), capacity))
+        for sym in cf.SYMMETRIES:
+            f.write(bytes(sym.src))
+            f.write(bytes(cf.FACES.index(sym.color_map[face]) for face in cf.FACES))
+            f.write(bytes(sym.move_back))
+        f.write(slots)
+
+
+class ShallowTable:
+    """mmap 只读打开生成的表文件；查询为 O(1) 期望探测次数"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_depth, sym_count, self.entry_count, self.capacity = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} 不是 v{VERSION} 浅层解表')
+        if sym_count != len(cf.SYMMETRIES):
+            raise ValueError(f'{path} 的对称数 {sym_count} 与当前模型不一致')
+        self._record_size = KEY_SIZE + 1 + self.max_depth
+        self._slots_offset = HEADER.size + sym_count * (54 + 6 + len(cf.MOVES))
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, cubestring):
+        """返回还原 cubestring 的最优转动列表；不在表中（深度超出或非法）返回 None"""
+        cubestring = cubestring.strip()
+        if len(cubestring) != 54 or not set(cubestring) <= _FACE_CHARS:
+            return None
+        if any(cubestring[i] != face for face, i in zip(cf.FACES, cf.CENTER_INDEXES)):
+            return None
+        canon, k = cf.canonicalize(cubestring)
+        key = cf.pack_state(canon)
+        mask = self.capacity - 1
+        slot = fnv1a32(key) & mask
+        for _ in range(self.capacity):
+            offset = self._slots_offset + slot * self._record_size
+            length = self._map[offset + KEY_SIZE]
+            if length == EMPTY_SLOT:
+                return None
+            if self._map[offset:offset + KEY_SIZE] == key:
+                moves = self._map[offset + KEY_SIZE + 1:offset + KEY_SIZE + 1 + length]
+                back = cf.SYMMETRIES[k].move_back
+                return [cf.MOVES[back[m]] for m in moves]
+            slot = (slot + 1) & mask
+        return None
+
+
+def _cmd_build(args):
+    t0 = time.time()
+    entries = build_entries(args.depth, workers=args.workers)
+    write_table(args.out, entries, args.depth)
+    print(f'已写入 {args.out}：{len(entries)} 个代表元，最大深度 {args.depth}，'
+          f'总耗时 {time.time() - t0:.1f}s')
+
+
+def _cmd_lookup(args):
+    with ShallowTable(args.table) as table:
+        for cubestring in args.cubestrings:
+            moves = table.lookup(cubestring)
+            if moves is None:
+                print(f'{cubestring}: [MISS] 不在深度 ≤ {table.max_depth} 的表中')
+            else:
+                solved = cf.apply_moves(cubestring, moves) == cf.SOLVED
+                print(f'{cubestring}: {" ".join(moves) or "(已还原)"} '
+                      f'[{len(moves)} 步, {"OK" if solved else "ERROR"}]')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='浅层状态最优解查表')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='BFS 生成表文件')
+    build.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help='最大深度（默认 7）')
+    build.add_argument('--out', default='shallow-table.bin')
+    build.add_argument('--workers', type=int, default=None, help='进程数（默认 CPU 核数）')
+    build.set_defaults(func=_cmd_build)
+
+    lookup = sub.add_parser('lookup', help='查询 cubestring')
+    lookup.add_argument('table')
+    lookup.add_argument('cubestrings', nargs='+')
+    lookup.set_defaults(func=_cmd_lookup)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())